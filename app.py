@@ -1,14 +1,20 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
-import threading
-import json
 import os
 from datetime import datetime
 
+from config.settings import (
+    KEEP_ALIVE, PINNED_KEEP_ALIVE, RESPONSE_CACHE_ENABLED, JOURNAL_DIR, EXPORT_DIR, CONTEXT_STRATEGY,
+)
 from config.theme import CustomTheme
 from ui.components import create_top_frame, create_toolbar
-from ui.message_widgets import MessagesManager
-from services.ollama_service import process_ollama_message
+from ui.chat_session import ChatSession
+from services.exporters import EXPORTERS, export_records
+from services.response_cache import ResponseCache
+from services.journal import BackgroundWriter
+from services.metrics import MetricsStore
+from services.model_catalog import ModelCatalog
+from services.transport import OllamaTransport
 
 
 class OllamaGUI:
@@ -17,6 +23,11 @@ class OllamaGUI:
         self.root.title("Ollama AI Chat")
         self.root.geometry("900x700")
 
+        # One long-lived connection pool and event loop shared by every session;
+        # started first so the client library loads while the window is built
+        self.transport = OllamaTransport()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
         # Set theme
         self.theme = CustomTheme()
         self.apply_theme()
@@ -26,38 +37,28 @@ class OllamaGUI:
         self.main_frame.pack(fill="both", expand=True, padx=10, pady=10)
 
         # Top frame - Model selection and settings
-        self.top_frame, self.model_var, self.show_thinking_var, self.status_dot, self.status_label = create_top_frame(
-            self.main_frame, self.theme
-        )
-
-        # Middle frame - Chat area
-        self.chat_frame = ttk.Frame(self.main_frame)
-        self.chat_frame.pack(fill="both", expand=True, pady=(0, 10))
-
-        # Chat canvas
-        self.chat_canvas = tk.Canvas(
-            self.chat_frame, bg=self.theme.bg_color, highlightthickness=0
-        )
-        self.chat_canvas.pack(side=tk.LEFT, fill="both", expand=True)
-
-        # Scrollbar
-        self.scrollbar = ttk.Scrollbar(
-            self.chat_frame, orient="vertical", command=self.chat_canvas.yview
-        )
-        self.scrollbar.pack(side=tk.RIGHT, fill="y")
-        self.chat_canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Inner frame - Will hold messages
-        self.messages_frame = ttk.Frame(self.chat_canvas)
-        self.messages_frame.bind(
-            "<Configure>",
-            lambda e: self.chat_canvas.configure(scrollregion=self.chat_canvas.bbox("all")),
-        )
-
-        self.canvas_frame = self.chat_canvas.create_window(
-            (0, 0), window=self.messages_frame, anchor="nw"
-        )
-        self.chat_canvas.bind("<Configure>", self.on_canvas_configure)
+        (
+            self.top_frame,
+            self.model_var,
+            self.model_combo,
+            self.show_thinking_var,
+            self.show_thinking_check,
+            self.pin_model_var,
+            self.bypass_cache_var,
+            self.status_dot,
+            self.status_label,
+            self.resident_label,
+        ) = create_top_frame(self.main_frame, self.theme)
+        self.transport.residency.listeners.append(lambda: self.root.after(0, self.update_resident_models))
+
+        # The user's own choice of showing thinking, None until they click the option
+        self.thinking_choice = None
+        self.show_thinking_check.config(command=self.on_thinking_toggled)
+
+        # Middle frame - One tab per chat session
+        self.notebook = ttk.Notebook(self.main_frame)
+        self.notebook.pack(fill="both", expand=True, pady=(0, 10))
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
 
         # Bottom frame - Input area
         self.input_frame = ttk.Frame(self.main_frame)
@@ -96,25 +97,72 @@ class OllamaGUI:
         self.send_button.bind("<Enter>", lambda e: self.send_button.config(bg="#78A5EB"))
         self.send_button.bind("<Leave>", lambda e: self.send_button.config(bg=self.theme.button_bg))
 
-        # Toolbar
-        self.toolbar_frame, self.toolbar_buttons = create_toolbar(
-            self.main_frame, self.theme, self.clear_chat, self.save_conversation, self.change_theme
+        # Stop button, enabled while a reply is streaming
+        self.stop_button = tk.Button(
+            self.input_frame,
+            text="Durdur",
+            bg=self.theme.user_msg_bg,
+            fg=self.theme.user_msg_fg,
+            relief="flat",
+            font=("Segoe UI", 10, "bold"),
+            padx=15,
+            state=tk.DISABLED,
+            command=self.stop_generation,
         )
-
-        # Conversation history
-        self.conversation = []
-
-        # Message manager
-        self.message_manager = MessagesManager(
-            self.messages_frame,
-            self.chat_canvas,
+        self.stop_button.pack(side=tk.RIGHT, padx=(0, 5))
+
+        # Toolbar, built once the window has been drawn
+        self.toolbar_frame = None
+        self.toolbar_buttons = []
+        self.search_panel = None
+        self.stats_panel = None
+        self.compare_panel = None
+        self.root.after_idle(self.build_toolbar)
+
+        # Identical requests are answered from disk unless bypassed for the model
+        self.response_cache = ResponseCache() if RESPONSE_CACHE_ENABLED else None
+        self.cache_bypass_models = set()
+
+        # Journals and saved files are written off the Tk thread
+        self.journal_writer = BackgroundWriter()
+
+        # Per-model generation metrics, optionally logged for capacity planning
+        self.metrics = MetricsStore(self.journal_writer)
+
+        # Installed models: the cached list right away, the server's list once the window is up
+        self.model_catalog = ModelCatalog()
+        self.update_model_list(self.model_catalog.names())
+        self.root.after_idle(self.refresh_models)
+
+        # Chat sessions, one per notebook tab
+        self.sessions = []
+        self.session_count = 0
+        self.switching_tabs = False
+        self.new_session()
+
+        # Load the selected model ahead of the first message
+        self.warm_up_id = 0
+        self.pinned_model = None  # Model the server was last asked to keep loaded indefinitely
+        self.model_var.trace_add("write", lambda *args: self.on_model_selected())
+        self.pin_model_var.trace_add("write", lambda *args: self.on_pin_changed())
+        self.bypass_cache_var.trace_add("write", lambda *args: self.on_cache_bypass_changed())
+        self.warm_up_model()
+
+    def build_toolbar(self):
+        self.toolbar_frame, self.toolbar_buttons = create_toolbar(
+            self.main_frame,
             self.theme,
-            self.model_var
+            self.clear_chat,
+            self.save_conversation,
+            self.change_theme,
+            self.new_session,
+            self.close_session,
+            self.load_conversation,
+            self.open_search_panel,
+            self.open_stats_panel,
+            self.open_compare_panel,
         )
 
-        # Welcome message
-        self.message_manager.add_system_message("Ollama AI Chat'e hoş geldiniz. Seçili model: " + self.model_var.get())
-
     def apply_theme(self):
         self.root.configure(bg=self.theme.bg_color)
 
@@ -134,9 +182,134 @@ class OllamaGUI:
             arrowsize=14,
         )
 
-    def on_canvas_configure(self, event):
-        # Resize window according to canvas width
-        self.chat_canvas.itemconfig(self.canvas_frame, width=event.width)
+        # Session tabs
+        style.configure("TNotebook", background=self.theme.bg_color, borderwidth=0)
+        style.configure("TNotebook.Tab", background=self.theme.ai_msg_bg, foreground=self.theme.text_color)
+        style.map("TNotebook.Tab", background=[("selected", self.theme.user_msg_bg)])
+
+    @property
+    def active_session(self):
+        return self.sessions[self.notebook.index("current")]
+
+    def new_session(self, history_path=None):
+        """Open a new chat tab using the selected model, optionally continuing a saved conversation"""
+        # Journals are continued in place; saved exports start a fresh journal
+        journal_path = history_path if history_path and history_path.endswith(".jsonl") else None
+
+        self.session_count += 1
+        session = ChatSession(
+            self, self.notebook, f"Sohbet {self.session_count}", self.model_var.get(), journal_path
+        )
+        self.sessions.append(session)
+        self.notebook.add(session.frame, text=session.title)
+        self.notebook.select(session.frame)
+
+        if history_path:
+            session.open_history(history_path)
+        else:
+            # Welcome message
+            session.message_manager.add_system_message("Ollama AI Chat'e hoş geldiniz. Seçili model: " + session.model)
+        return session
+
+    def load_conversation(self):
+        """Open a session journal or a saved conversation in a new tab"""
+        filename = filedialog.askopenfilename(
+            initialdir=JOURNAL_DIR if os.path.isdir(JOURNAL_DIR) else None,
+            filetypes=[("Sohbet Günlüğü", "*.jsonl"), ("JSON Files", "*.json")],
+        )
+
+        if filename:
+            session = self.new_session(filename)
+            session.message_manager.add_system_message(f"Konuşma yüklendi: {os.path.basename(filename)}")
+
+    def close_session(self):
+        """Close the active tab, cancelling its requests"""
+        session = self.active_session
+        session.close()
+        self.sessions.remove(session)
+        self.notebook.forget(session.frame)
+        session.frame.destroy()
+
+        if not self.sessions:
+            self.new_session()
+
+    def on_tab_changed(self, event):
+        session = self.active_session
+
+        # Show the session's model without triggering a warm-up
+        self.switching_tabs = True
+        self.model_var.set(session.model)
+        self.switching_tabs = False
+
+        self.on_session_status(session)
+
+    def on_session_status(self, session):
+        # Background tabs show their state in the tab title
+        busy = " …" if session.is_processing else ""
+        self.notebook.tab(session.frame, text=session.title + busy)
+
+        if session is self.active_session:
+            self.status_dot.itemconfig(1, fill=session.status_color)
+            self.status_label.config(text=session.status_text)
+            self.stop_button.config(state=tk.NORMAL if session.is_processing else tk.DISABLED)
+
+    def on_model_selected(self):
+        # Show the cache bypass and thinking settings of the newly shown model
+        self.bypass_cache_var.set(self.model_var.get() in self.cache_bypass_models)
+        self.update_thinking_option()
+
+        if self.switching_tabs:
+            return
+
+        self.active_session.model_var.set(self.model_var.get())
+        self.update_pinned_model()
+        self.warm_up_model()
+
+    def refresh_models(self):
+        """Fetch the installed models and their details on the transport thread"""
+        future = self.transport.call(self.model_catalog.refresh)
+        future.add_done_callback(
+            lambda f: self.root.after(0, lambda: self.on_models_refreshed(f))
+        )
+
+    def on_models_refreshed(self, future):
+        if future.exception() is None:
+            self.update_model_list(future.result())
+        elif not self.model_catalog.names():
+            self.active_session.message_manager.add_system_message(
+                f"Model listesi alınamadı: {str(future.exception())}"
+            )
+
+    def update_model_list(self, names):
+        if not names:
+            return
+
+        self.model_combo["values"] = names
+        if self.model_var.get() not in names:
+            # The selected default is not installed; switch to a model that is
+            self.model_var.set(names[0])
+        self.update_thinking_option()
+
+    def update_resident_models(self):
+        self.resident_label.config(text=self.transport.residency.describe())
+
+    def on_thinking_toggled(self):
+        self.thinking_choice = self.show_thinking_var.get()
+
+    def update_thinking_option(self):
+        """Enable the thinking option for reasoning models only"""
+        info = self.model_catalog.get(self.model_var.get())
+        if info is not None and not info.thinking:
+            self.show_thinking_var.set(False)
+            self.show_thinking_check.state(["disabled"])
+            return
+
+        self.show_thinking_check.state(["!disabled"])
+        if self.thinking_choice is not None:
+            self.show_thinking_var.set(self.thinking_choice)
+        elif info is not None:
+            # Reasoning models show their thinking until the user chooses otherwise
+            self.show_thinking_var.set(True)
 
     def handle_return(self, event):
         if not event.state & 0x1:  # Shift key is not pressed
@@ -151,72 +324,192 @@ class OllamaGUI:
         # Clear input box
         self.input_box.delete("1.0", tk.END)
 
-        # Add user message to chat
-        self.message_manager.add_user_message(user_message)
-
-        # Add to chat history
-        self.conversation.append({"role": "user", "content": user_message})
-
-        # Reset for new response
-        self.message_manager.reset_response_widgets()
-
-        # Disable interface during processing
-        self.send_button.config(state=tk.DISABLED)
-        self.status_dot.itemconfig(1, fill="#FFA500")  # Orange = Processing
-        self.status_label.config(text="İşleniyor...")
-
-        # Process in background
-        threading.Thread(
-            target=self.process_message,
-            args=(user_message,),
-            daemon=True
-        ).start()
-
-    def process_message(self, user_message):
-        try:
-            # Get selected model
-            model = self.model_var.get()
-
-            # Process message with Ollama API
-            ai_response = process_ollama_message(
-                model,
-                self.conversation.copy(),
-                self.message_manager,
-                self.root,
-                self.show_thinking_var.get()
-            )
+        self.active_session.send(user_message)
+
+    def stop_generation(self):
+        """Cancel the active tab's streaming reply; the partial answer is kept"""
+        self.stop_button.config(state=tk.DISABLED)
+        self.active_session.stop_generation()
+
+    def on_cache_bypass_changed(self):
+        if self.bypass_cache_var.get():
+            self.cache_bypass_models.add(self.model_var.get())
+        else:
+            self.cache_bypass_models.discard(self.model_var.get())
+
+    def response_cache_for(self, model):
+        """Response cache to use for a model, or None when it is disabled or bypassed"""
+        if model in self.cache_bypass_models:
+            return None
+        return self.response_cache
+
+    def keep_alive(self, model):
+        """keep_alive value sent with requests for a model; only the pinned one stays loaded"""
+        return PINNED_KEEP_ALIVE if model == self.pinned_model else KEEP_ALIVE
+
+    def on_pin_changed(self):
+        self.update_pinned_model()
+        if self.pin_model_var.get():
+            self.warm_up_model()
+
+    def update_pinned_model(self):
+        """Pin the selected model if pinning is on, and release the model pinned before it"""
+        model = self.model_var.get() if self.pin_model_var.get() else None
+        previous, self.pinned_model = self.pinned_model, model
+        if not previous or previous == model:
+            return
+
+        async def job(client):
+            from services.ollama_service import warm_up_model
+            # keep_alive=0 lets the server unload the model right away
+            await warm_up_model(client, previous, 0)
+
+        self.transport.call(job)
+
+    def warm_up_model(self):
+        """Ask the server to load the selected model in the background"""
+        self.warm_up_id += 1
+        warm_up_id = self.warm_up_id
+        model = self.model_var.get()
+
+        if not self.active_session.is_processing:
+            self.status_dot.itemconfig(1, fill="#2196F3")  # Blue = Loading model
+            self.status_label.config(text="Model yükleniyor...")
+
+        keep_alive = self.keep_alive(model)
+
+        async def job(client):
+            # Imported on the transport thread, which loads the client library
+            from services.ollama_service import warm_up_model
+            await warm_up_model(client, model, keep_alive)
+
+        future = self.transport.call(job)
+        future.add_done_callback(lambda f: self.on_warm_up_done(f, warm_up_id, model))
+
+    def on_warm_up_done(self, future, warm_up_id, model):
+        # Runs on the transport thread
+        error = future.exception()
+        error_msg = f"Model yüklenemedi ({model}): {str(error)}" if error else None
+        self.root.after(0, lambda: self.on_warm_up_finished(warm_up_id, error_msg))
+
+    def on_warm_up_finished(self, warm_up_id, error_msg):
+        # Ignore results of selections that were changed since
+        session = self.active_session
+        if warm_up_id != self.warm_up_id or session.is_processing:
+            return
+
+        if error_msg:
+            self.status_dot.itemconfig(1, fill="#F44336")  # Red = Model could not be loaded
+            self.status_label.config(text="Model yüklenemedi")
+            session.message_manager.add_system_message(error_msg)
+        else:
+            self.on_session_status(session)
+
+    def summarize_messages(self, messages, previous_summary):
+        """Blocking summary request, called from the context window's worker thread"""
+        async def job(client):
+            from services.ollama_service import summarize_messages
+            return await summarize_messages(client, messages, previous_summary)
+
+        return self.transport.call(job).result()
+
+    def embed_texts(self, texts, timeout=None):
+        """Blocking embedding request, called from retrieval memory threads (or briefly, with a timeout)"""
+        async def job(client):
+            from services.ollama_service import embed_texts
+            return await embed_texts(client, texts)
 
-            # Add AI response to chat history
-            self.conversation.append({"role": "assistant", "content": ai_response})
+        return self.transport.call(job).result(timeout)
 
-        except Exception as e:
-            error_msg = f"Hata: {str(e)}"
-            self.root.after(0, lambda: self.message_manager.add_system_message(error_msg))
+    def create_memory(self, journal_path):
+        """Retrieval memory for a session's journal, or None unless the retrieval strategy can run"""
+        if CONTEXT_STRATEGY != "retrieval":
+            return None
 
-        # Re-enable interface
-        self.root.after(0, lambda: self.send_button.config(state=tk.NORMAL))
-        self.root.after(0, lambda: self.status_dot.itemconfig(1, fill="#4CAF50"))  # Green = Ready
-        self.root.after(0, lambda: self.status_label.config(text="Hazır"))
+        from services.retrieval_memory import RetrievalMemory, retrieval_available, memory_path
+        if not retrieval_available():
+            return None
+        return RetrievalMemory(self.embed_texts, memory_path(journal_path), self.journal_writer)
+
+    def open_search_panel(self):
+        if self.search_panel:
+            self.search_panel.lift()
+        else:
+            from ui.search_panel import SearchPanel
+            self.search_panel = SearchPanel(self)
+
+    def open_stats_panel(self):
+        if self.stats_panel:
+            self.stats_panel.lift()
+        else:
+            from ui.stats_panel import StatsPanel
+            self.stats_panel = StatsPanel(self)
+
+    def open_compare_panel(self):
+        if self.compare_panel:
+            self.compare_panel.lift()
+        else:
+            from ui.compare_panel import ComparePanel
+            self.compare_panel = ComparePanel(self)
+
+    def open_search_hit(self, hit):
+        """Open the conversation of a search result and jump to its turn"""
+        session = self.new_session(hit.path)
+        session.show_turn(hit.turn, hit.turns)
+
+    def on_close(self):
+        for session in self.sessions:
+            session.close()
+        self.transport.close()
+        self.journal_writer.close()
+        self.root.destroy()
 
     def clear_chat(self):
-        for widget in self.messages_frame.winfo_children():
-            widget.destroy()
-        self.conversation = []
-        self.message_manager.reset_response_widgets()
-        self.message_manager.add_system_message("Sohbet temizlendi. Seçili model: " + self.model_var.get())
+        self.active_session.clear()
 
     def save_conversation(self):
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        os.makedirs(EXPORT_DIR, exist_ok=True)
         filename = filedialog.asksaveasfilename(
+            initialdir=EXPORT_DIR,
             defaultextension=".json",
-            filetypes=[("JSON Files", "*.json")],
+            filetypes=[(exporter.description, "*" + extension) for extension, exporter in EXPORTERS.items()],
             initialfile=f"ollama_chat_{timestamp}.json",
         )
 
         if filename:
-            with open(filename, "w", encoding="utf-8") as f:
-                json.dump(self.conversation, f, ensure_ascii=False, indent=2)
-            self.message_manager.add_system_message(f"Konuşma başarıyla kaydedildi: {os.path.basename(filename)}")
+            session = self.active_session
+            records, total = session.export_source()
+
+            def progress(count):
+                # Runs on the writer thread
+                self.root.after(0, lambda: self.on_export_progress(count, total))
+
+            def write():
+                # Streamed turn by turn on the writer thread
+                export_records(records(), filename, title=session.title, progress=progress)
+
+            def on_done(error):
+                # Runs on the writer thread
+                if error:
+                    message = f"Konuşma kaydedilemedi: {str(error)}"
+                else:
+                    message = f"Konuşma başarıyla kaydedildi: {os.path.basename(filename)}"
+                self.root.after(0, lambda: self.on_save_finished(session, message))
+
+            self.status_label.config(text="Dışa aktarılıyor...")
+            self.journal_writer.submit(write, on_done)
+
+    def on_export_progress(self, count, total):
+        done = f"{count}/{total}" if total else str(count)
+        self.status_label.config(text=f"Dışa aktarılıyor... {done}")
+
+    def on_save_finished(self, session, message):
+        self.on_session_status(self.active_session)
+
+        # The tab may have been closed while the file was being written
+        if session in self.sessions:
+            session.message_manager.add_system_message(message)
 
     def change_theme(self):
         # Toggle between light and dark themes
@@ -236,35 +529,12 @@ class OllamaGUI:
             fg=self.theme.text_color,
             insertbackground=self.theme.text_color
         )
-        self.chat_canvas.config(bg=self.theme.bg_color)
         self.send_button.config(bg=self.theme.button_bg, fg=self.theme.button_fg)
+        self.stop_button.config(bg=self.theme.user_msg_bg, fg=self.theme.user_msg_fg)
 
         for btn in self.toolbar_buttons:
             btn.config(bg=self.theme.user_msg_bg, fg=self.theme.user_msg_fg)
 
-        # Rebuild chat
-        self.rebuild_chat()
-
-    def rebuild_chat(self):
-        """Rebuild entire chat from message history"""
-        # Clear all messages
-        for widget in self.messages_frame.winfo_children():
-            widget.destroy()
-
-        # Add welcome message
-        self.message_manager.add_system_message("Ollama AI Chat'e hoş geldiniz. Seçili model: " + self.model_var.get())
-
-        # Add history messages
-        for msg in self.conversation:
-            if msg["role"] == "user":
-                self.message_manager.add_user_message(msg["content"])
-            elif msg["role"] == "assistant":
-                # Create new message frame
-                frame, msg_frame = self.message_manager.add_new_ai_message_frame()
-                self.message_manager.current_ai_message_frame = msg_frame
-
-                # Add message
-                self.message_manager.add_ai_response(msg["content"])
-
-                # Cleanup
-                self.message_manager.current_ai_message_frame = None
\ No newline at end of file
+        # Recolor existing messages in place
+        for session in self.sessions:
+            session.apply_theme()
@@ -0,0 +1,336 @@
+"""End-to-end benchmark: scripted conversations against the local stub server
+
+Drives OllamaGUI on a Tk display when one is available, starting Xvfb if it
+is installed and no display is set. Otherwise the same transport, stream
+bridge and render scheduler pipeline runs with the Tk root and message
+widgets replaced by a headless loop and view.
+
+Reports event-loop lag, render callbacks per second, frame time, peak RSS
+and wall time, and saves them as JSON so runs can be compared:
+
+    python -m benchmarks.bench_end_to_end --turns 5 --tokens-per-second 0
+    python -m benchmarks.bench_end_to_end --compare benchmarks/results/<previous>.json
+"""
+import argparse
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+from benchmarks.stub_server import StubOllamaServer, add_config_arguments, config_from_args
+
+HEARTBEAT_MS = 10  # Tk mode measures lag with a timer that should fire this often
+POLL_MS = 20
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+MODEL = "deepseek-r1:14b"
+
+
+def summarize(values, scale=1000.0):
+    """Mean, p50, p95 and max of a list of seconds, in milliseconds"""
+    if not values:
+        return {"mean": None, "p50": None, "p95": None, "max": None}
+    ordered = sorted(values)
+    pick = lambda fraction: round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * scale, 3)
+    return {
+        "mean": round(sum(ordered) / len(ordered) * scale, 3),
+        "p50": pick(0.5),
+        "p95": pick(0.95),
+        "max": round(ordered[-1] * scale, 3),
+    }
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+class LoopStats:
+    """Timings collected while a benchmark runs"""
+
+    def __init__(self):
+        self.lags = []
+        self.frames = []
+        self.ttfts = []
+
+    def instrument(self, scheduler):
+        """Time every flush of a RenderScheduler"""
+        flush = scheduler._flush
+
+        def timed_flush():
+            started = time.perf_counter()
+            flush()
+            self.frames.append(time.perf_counter() - started)
+
+        scheduler._flush = timed_flush
+
+
+class HeadlessLoop:
+    """Stand-in for the Tk root: runs after() callbacks on the thread calling run_until()"""
+
+    def __init__(self, stats):
+        self.stats = stats
+        self.timers = []
+        self.sequence = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+
+    def after(self, ms, func, *args):
+        with self.lock:
+            self.sequence += 1
+            heapq.heappush(self.timers, (time.perf_counter() + ms / 1000, self.sequence, func, args))
+        self.wakeup.set()
+
+    def run_until(self, condition):
+        while not condition():
+            with self.lock:
+                due = self.timers[0][0] if self.timers else None
+                if due is not None and due <= time.perf_counter():
+                    _, _, func, args = heapq.heappop(self.timers)
+                else:
+                    func = None
+
+            if func is None:
+                self.wakeup.clear()
+                self.wakeup.wait(None if due is None else max(0, due - time.perf_counter()))
+                continue
+
+            # Lag is how late a callback runs compared to when it was due
+            self.stats.lags.append(time.perf_counter() - due)
+            func(*args)
+
+
+class HeadlessView:
+    """Does the non-widget work of the AI message view for each flushed delta"""
+
+    def __init__(self):
+        from utils.markdown_stream import FenceParser
+
+        self.parser = FenceParser()
+        self.thinking = ""
+        self.segment_events = 0
+
+    def append_thinking(self, delta):
+        self.thinking += delta
+
+    def append_answer(self, delta):
+        self.segment_events += len(self.parser.feed(delta))
+
+    def finish(self):
+        self.segment_events += len(self.parser.close())
+        self.parser = type(self.parser)()
+        self.thinking = ""
+
+
+def prompts_for(turns):
+    return [f"Soru {i + 1}: bu kod nasıl çalışıyor ve neden hızlı?" for i in range(turns)]
+
+
+def run_headless(url, turns, stats):
+    from services.context_window import create_context_window
+    from services.conversation import Conversation, USER, ASSISTANT
+    from services.metrics import ResponseMetrics
+    from services.transport import OllamaTransport
+    from ui.render_scheduler import RenderScheduler, StreamBridge
+
+    loop = HeadlessLoop(stats)
+    transport = OllamaTransport(host=url)
+    scheduler = RenderScheduler(loop)
+    stats.instrument(scheduler)
+
+    view = HeadlessView()
+    scheduler.set_handler("thinking", view.append_thinking)
+    scheduler.set_handler("answer", view.append_answer)
+
+    context_window = create_context_window()
+    conversation = Conversation()
+    try:
+        for prompt in prompts_for(turns):
+            conversation.add(USER, prompt)
+            finished = []
+            metrics = ResponseMetrics(MODEL)
+            bridge = StreamBridge(scheduler, True, finished.append, finished.append, metrics)
+            bridge.watch(transport.stream_chat(MODEL, context_window.build(conversation).messages, bridge, key="bench"))
+
+            loop.run_until(lambda: finished)
+            if not hasattr(finished[0], "answer"):
+                raise finished[0]
+
+            conversation.add(ASSISTANT, finished[0].answer)
+            view.finish()
+            stats.ttfts.append(metrics.ttft)
+    finally:
+        transport.close()
+
+
+def open_display():
+    """Create a Tk root, starting Xvfb when there is no display; returns (root, xvfb process)"""
+    import tkinter as tk
+
+    try:
+        return tk.Tk(), None
+    except tk.TclError:
+        if not shutil.which("Xvfb"):
+            raise
+
+    display = ":97"
+    xvfb = subprocess.Popen(["Xvfb", display, "-screen", "0", "1280x1024x24"], stderr=subprocess.DEVNULL)
+    os.environ["DISPLAY"] = display
+    for _ in range(50):
+        time.sleep(0.1)
+        try:
+            return tk.Tk(), xvfb
+        except tk.TclError:
+            continue
+    xvfb.terminate()
+    raise RuntimeError("Xvfb başlatılamadı")
+
+
+def run_tk(root, turns, stats):
+    from app import OllamaGUI
+
+    app = OllamaGUI(root)
+    session = app.active_session
+    stats.instrument(session.render_scheduler)
+    prompts = prompts_for(turns)
+
+    def heartbeat(expected):
+        now = time.perf_counter()
+        stats.lags.append(max(0.0, now - expected))
+        root.after(HEARTBEAT_MS, heartbeat, now + HEARTBEAT_MS / 1000)
+
+    def step():
+        if session.is_processing:
+            root.after(POLL_MS, step)
+            return
+        if not prompts:
+            root.quit()
+            return
+
+        app.input_box.insert("1.0", prompts.pop(0))
+        app.send_message()
+        root.after(POLL_MS, step)
+
+    root.after(HEARTBEAT_MS, heartbeat, time.perf_counter() + HEARTBEAT_MS / 1000)
+    root.after(0, step)
+    root.mainloop()
+
+    stats.ttfts = list(app.metrics.models[MODEL].ttfts) if MODEL in app.metrics.models else []
+    app.on_close()
+
+
+def run(args):
+    # Keep benchmark journals and caches away from the user's data
+    os.environ["OLLAMA_THINK_DATA_DIR"] = tempfile.mkdtemp(prefix="ollama-think-bench-")
+    os.environ["OLLAMA_THINK_CACHE"] = "0"
+
+    config = config_from_args(args)
+    server = StubOllamaServer(config)
+    url = server.start()
+    os.environ["OLLAMA_HOST"] = url
+
+    stats = LoopStats()
+    mode = args.mode
+    root = xvfb = None
+    if mode in ("auto", "tk"):
+        try:
+            root, xvfb = open_display()
+            mode = "tk"
+        except Exception as e:
+            if mode == "tk":
+                raise
+            print(f"Ekran yok ({e}); arayüz katmanı olmadan çalıştırılıyor", file=sys.stderr)
+            mode = "headless"
+
+    started = time.perf_counter()
+    try:
+        if mode == "tk":
+            run_tk(root, args.turns, stats)
+        else:
+            run_headless(url, args.turns, stats)
+    finally:
+        wall_time = time.perf_counter() - started
+        server.stop()
+        if xvfb:
+            xvfb.terminate()
+
+    return {
+        "benchmark": "end_to_end",
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "mode": mode,
+        "turns": args.turns,
+        "stub": config.to_dict(),
+        "wall_time_s": round(wall_time, 3),
+        "callbacks_per_s": round(len(stats.frames) / wall_time, 1) if wall_time else None,
+        "frames": len(stats.frames),
+        "frame_ms": summarize(stats.frames),
+        "loop_lag_ms": summarize(stats.lags),
+        "ttft_ms": summarize([t for t in stats.ttfts if t is not None]),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def flatten(result, prefix=""):
+    """Numeric values of a result keyed by dotted path"""
+    values = {}
+    for key, value in result.items():
+        if isinstance(value, dict):
+            values.update(flatten(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            values[prefix + key] = value
+    return values
+
+
+def print_result(result, baseline=None):
+    current = flatten(result)
+    previous = flatten(baseline) if baseline else {}
+    for key, value in current.items():
+        if key.startswith("stub.") or key == "turns":
+            continue
+        line = f"{key:24} {value:>12}"
+        old = previous.get(key)
+        if old:
+            line += f"   önceki {old:>12}  ({(value - old) / old * 100:+.1f}%)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ollama AI Chat uçtan uca performans testi")
+    parser.add_argument("--mode", choices=("auto", "tk", "headless"), default="auto")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--output", help="Sonuç dosyası (varsayılan: benchmarks/results/ altında)")
+    parser.add_argument("--compare", help="Karşılaştırılacak önceki sonuç dosyası")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    result = run(args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print(f"mod: {result['mode']}")
+    print_result(result, baseline)
+
+    output = args.output
+    if not output:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"e2e_{result['mode']}_{stamp}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"Sonuçlar kaydedildi: {output}")
+
+
+if __name__ == "__main__":
+    main()
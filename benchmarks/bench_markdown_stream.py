@@ -0,0 +1,65 @@
+"""Micro-benchmark: per-delta cost of FenceParser as the message grows
+
+Run with: python -m benchmarks.bench_markdown_stream
+"""
+import re
+import time
+
+from utils.markdown_stream import FenceParser
+
+DELTA_SIZE = 8
+PARAGRAPH = "Some prose about the answer, with `inline` code and more words.\n"
+CODE_BLOCK = "```python\ndef f(x):\n    return x * 2\n```\n"
+
+
+def build_message(length):
+    """Build a message of roughly the given length mixing prose and code"""
+    parts = []
+    size = 0
+    while size < length:
+        part = CODE_BLOCK if len(parts) % 4 == 3 else PARAGRAPH
+        parts.append(part)
+        size += len(part)
+    return "".join(parts)
+
+
+def split_deltas(message):
+    return [message[i:i + DELTA_SIZE] for i in range(0, len(message), DELTA_SIZE)]
+
+
+def rescan_full_text(deltas):
+    """Old behaviour: rerun the fence regex over the whole message on every delta"""
+    pattern = re.compile(r'```(.*?)```', re.DOTALL)
+    message = ""
+    for delta in deltas:
+        message += delta
+        list(pattern.finditer(message))
+
+
+def feed_parser(deltas):
+    parser = FenceParser()
+    for delta in deltas:
+        parser.feed(delta)
+    parser.close()
+
+
+def per_delta_us(func, deltas, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(deltas)
+        best = min(best, time.perf_counter() - start)
+    return best / len(deltas) * 1e6
+
+
+def main():
+    print(f"{'message chars':>14} {'deltas':>8} {'rescan us/delta':>16} {'parser us/delta':>16}")
+    for length in (1_000, 10_000, 50_000, 200_000):
+        deltas = split_deltas(build_message(length))
+        rescan = per_delta_us(rescan_full_text, deltas, repeat=1)
+        parser = per_delta_us(feed_parser, deltas)
+        print(f"{length:>14} {len(deltas):>8} {rescan:>16.2f} {parser:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""Local stand-in for the Ollama HTTP API that streams synthetic replies
+
+Serves POST /api/chat as NDJSON with a configurable token rate, reply
+length, <think> block size and share of code blocks, plus GET /api/tags,
+GET /api/ps, POST /api/show and POST /api/embed (hashed bag-of-words
+vectors, so texts sharing words are similar). Loading a model can take
+time and evict others, like a server with limited memory. Run standalone
+with:
+
+    python -m benchmarks.stub_server --port 11435 --tokens-per-second 80
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+WORDS = (
+    "the model answers with a short explanation of how the code works and why "
+    "each step matters for performance memory latency and correctness"
+).split()
+CODE_LINES = (
+    "def handle(item):",
+    "    result = process(item)",
+    "    if result is None:",
+    "        return default",
+    "    return result * 2",
+    "for index, value in enumerate(values):",
+    "    total += value",
+)
+PARAGRAPH_TOKENS = 40  # Tokens per prose paragraph; each paragraph may become a code block instead
+EMBED_DIMENSIONS = 64
+
+
+class StubConfig:
+    """Shape and speed of the synthetic replies"""
+
+    def __init__(self, tokens_per_second=100.0, reply_tokens=400, think_tokens=100, code_density=0.25,
+                 models=("deepseek-r1:14b", "llama3:8b"), seed=0, load_seconds=0.0, max_loaded=0):
+        self.tokens_per_second = tokens_per_second
+        self.reply_tokens = reply_tokens
+        self.think_tokens = think_tokens
+        self.code_density = code_density
+        self.models = models
+        self.seed = seed
+        self.load_seconds = load_seconds  # Delay before a model that is not loaded answers
+        self.max_loaded = max_loaded  # Models held at once, least recently used evicted first; 0 is unlimited
+
+    def to_dict(self):
+        return dict(vars(self), models=list(self.models))
+
+
+def generate_tokens(config, rng):
+    """Token strings of one reply: optional <think> block, then prose and fenced code"""
+    tokens = []
+    if config.think_tokens:
+        tokens.append("<think>")
+        tokens.extend(rng.choice(WORDS) + " " for _ in range(config.think_tokens))
+        tokens.append("</think>\n\n")
+
+    produced = 0
+    while produced < config.reply_tokens:
+        count = min(PARAGRAPH_TOKENS, config.reply_tokens - produced)
+        if rng.random() < config.code_density:
+            tokens.append("```python\n")
+            tokens.extend(rng.choice(CODE_LINES) + "\n" for _ in range(max(1, count // 6)))
+            tokens.append("```\n\n")
+        else:
+            tokens.extend(rng.choice(WORDS) + " " for _ in range(count - 1))
+            tokens.append("\n\n")
+        produced += count
+    return tokens
+
+
+def embed_text(text):
+    """Unit vector counting the words of text in hashed buckets"""
+    vector = [0.0] * EMBED_DIMENSIONS
+    for word in text.lower().split():
+        vector[hashlib.md5(word.encode()).digest()[0] % EMBED_DIMENSIONS] += 1.0
+    norm = math.sqrt(sum(value * value for value in vector)) or 1.0
+    return [value / norm for value in vector]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    @property
+    def config(self):
+        return self.server.config
+
+    def do_GET(self):
+        if self.path == "/api/tags":
+            self.send_json({"models": [self.model_entry(name) for name in self.config.models]})
+        elif self.path == "/api/ps":
+            self.send_json({"models": [self.ps_entry(name) for name in list(self.server.loaded)]})
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if self.path == "/api/chat":
+            self.chat(body)
+        elif self.path == "/api/show":
+            self.show(body)
+        elif self.path == "/api/embed":
+            self.embed(body)
+        else:
+            self.send_error(404)
+
+    def model_entry(self, name):
+        return {"name": name, "model": name, "size": 4 * 1024 ** 3, "digest": "0" * 64, "details": {}}
+
+    def ps_entry(self, name):
+        expires_at = datetime.now(timezone.utc) + timedelta(minutes=5)
+        return dict(self.model_entry(name), size_vram=4 * 1024 ** 3, expires_at=expires_at.isoformat())
+
+    def show(self, body):
+        name = body.get("model", "")
+        if name not in self.config.models:
+            self.send_error(404)
+            return
+
+        reasoning = "r1" in name
+        self.send_json({
+            "template": "{{ .Prompt }}",
+            "details": {"family": "llama", "parameter_size": "8.0B", "quantization_level": "Q4_K_M"},
+            "model_info": {"llama.context_length": 131072},
+            "capabilities": ["completion", "thinking"] if reasoning else ["completion"],
+        })
+
+    def embed(self, body):
+        texts = body.get("input", "")
+        if isinstance(texts, str):
+            texts = [texts]
+        self.send_json({"model": body.get("model", ""), "embeddings": [embed_text(text) for text in texts]})
+
+    def send_json(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def chat(self, body):
+        model = body.get("model", "")
+        self.server.load(model)
+
+        # A chat without messages only loads the model (used for warm-up)
+        rng = random.Random(self.config.seed + self.server.next_request())
+        tokens = generate_tokens(self.config, rng) if body.get("messages") else []
+        prompt_tokens = sum(len(m.get("content", "")) // 4 for m in body.get("messages", []))
+
+        started = time.perf_counter_ns()
+        if body.get("stream", True):
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+
+            interval = 1.0 / self.config.tokens_per_second if self.config.tokens_per_second else 0
+            next_time = time.perf_counter()
+            try:
+                for token in tokens:
+                    if interval:
+                        next_time += interval
+                        delay = next_time - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+                    self.write_chunk(self.chunk(model, token, False))
+                self.write_chunk(self.final_chunk(model, len(tokens), prompt_tokens, started))
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                # The client cancelled the request
+                self.close_connection = True
+        else:
+            payload = self.final_chunk(model, len(tokens), prompt_tokens, started)
+            payload["message"]["content"] = "".join(tokens)
+            self.send_json(payload)
+
+        if body.get("keep_alive") in (0, "0", "0s"):
+            self.server.loaded.pop(model, None)
+
+    def chunk(self, model, content, done):
+        return {
+            "model": model,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "message": {"role": "assistant", "content": content},
+            "done": done,
+        }
+
+    def final_chunk(self, model, eval_count, prompt_tokens, started):
+        elapsed = time.perf_counter_ns() - started
+        payload = self.chunk(model, "", True)
+        payload.update({
+            "done_reason": "stop" if eval_count else "load",
+            "total_duration": elapsed,
+            "load_duration": 0,
+            "prompt_eval_count": prompt_tokens,
+            "prompt_eval_duration": 1_000_000,
+            "eval_count": eval_count,
+            "eval_duration": max(1, elapsed - 1_000_000),
+        })
+        return payload
+
+    def write_chunk(self, payload):
+        data = (json.dumps(payload) + "\n").encode()
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+class StubOllamaServer(ThreadingHTTPServer):
+    """Threaded stub server; start() serves on a background thread and returns the base URL"""
+
+    daemon_threads = True
+
+    def __init__(self, config=None, host="127.0.0.1", port=0):
+        super().__init__((host, port), StubHandler)
+        self.config = config or StubConfig()
+        self.loaded = OrderedDict()  # Loaded models, least recently used first
+        self.loads = 0  # Times a model had to be loaded
+        self._requests = 0
+        self._lock = threading.Lock()
+
+    def load(self, model):
+        """Mark a model used, loading it (and evicting others) if needed"""
+        with self._lock:
+            if model in self.loaded:
+                self.loaded.move_to_end(model)
+                return
+            self.loads += 1
+            while self.config.max_loaded and len(self.loaded) >= self.config.max_loaded:
+                self.loaded.popitem(last=False)
+            self.loaded[model] = True
+        time.sleep(self.config.load_seconds)
+
+    def next_request(self):
+        with self._lock:
+            self._requests += 1
+            return self._requests
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        threading.Thread(target=self.serve_forever, name="stub-ollama", daemon=True).start()
+        return self.url
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def add_config_arguments(parser):
+    """Command-line options shared by the stub and the benchmark harness"""
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="0 streams as fast as possible")
+    parser.add_argument("--reply-tokens", type=int, default=400)
+    parser.add_argument("--think-tokens", type=int, default=100)
+    parser.add_argument("--code-density", type=float, default=0.25, help="Share of paragraphs sent as code blocks")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--load-seconds", type=float, default=0.0, help="Delay when a model has to be loaded")
+    parser.add_argument("--max-loaded", type=int, default=0, help="Models held at once, 0 for unlimited")
+
+
+def config_from_args(args):
+    return StubConfig(
+        args.tokens_per_second, args.reply_tokens, args.think_tokens, args.code_density, seed=args.seed,
+        load_seconds=args.load_seconds, max_loaded=args.max_loaded,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=11435)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+
+    server = StubOllamaServer(config_from_args(args), port=args.port)
+    print(f"Stub Ollama sunucusu: {server.url}  (OLLAMA_HOST={server.url})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import os
+import sys
+import time
+
+
+def search_command(args):
+    """Query the index of saved conversations and print ranked turns"""
+    from config.settings import SEARCH_DIRS
+    from services.search_index import SearchIndex
+
+    index = SearchIndex.load()
+    started = time.perf_counter()
+    changed = index.update([os.path.abspath(d) for d in args.dirs] if args.dirs else SEARCH_DIRS)
+    index.save()
+    updated = time.perf_counter()
+
+    hits = index.search(" ".join(args.query), args.limit)
+    searched = time.perf_counter()
+
+    for hit in hits:
+        print(f"{hit.score:6.2f}  {hit.path}#{hit.turn}  [{hit.role}]")
+        print(f"        {hit.snippet}")
+
+    print(
+        f"{len(hits)} sonuç · {index.doc_count} mesaj · {changed} dosya güncellendi "
+        f"({(updated - started) * 1000:.1f} ms) · arama {(searched - updated) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+    return 0 if hits else 1
+
+
+def batch_command(args):
+    """Run a JSONL prompt file through the chat pipeline without a window"""
+    from services.batch import BatchRunner
+    from services.response_cache import ResponseCache
+    from services.transport import OllamaTransport
+
+    # Every in-flight request has a slot, so the queue never overflows
+    transport = OllamaTransport(max_concurrent=args.concurrency, queue_size=args.concurrency)
+    started = time.perf_counter()
+
+    def on_result(record):
+        status = f"HATA: {record['error']}" if "error" in record else f"{record['wall_time']:.2f} sn"
+        print(f"satır {record['line']}: {status}", file=sys.stderr)
+
+    runner = BatchRunner(
+        transport,
+        args.model,
+        args.output,
+        args.concurrency,
+        cache=ResponseCache() if args.cache else None,
+        on_result=on_result,
+    )
+    try:
+        completed, failed = runner.run(args.input, resume=args.resume)
+    except KeyboardInterrupt:
+        print("Durduruldu; kaldığı yerden devam etmek için --resume kullanın", file=sys.stderr)
+        return 130
+    finally:
+        transport.close()
+
+    print(
+        f"{completed} tamamlandı, {failed} hata · {time.perf_counter() - started:.1f} sn",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+def export_command(args):
+    """Convert saved conversations to another format, streaming each file record by record"""
+    from services.exporters import EXPORTERS, export_records
+    from services.journal import iter_conversation_records
+
+    extension = "." + args.format
+    exporter = EXPORTERS[extension]
+    failed = 0
+
+    for path in args.inputs:
+        directory = args.output_dir or os.path.dirname(path)
+        output = os.path.join(directory, os.path.splitext(os.path.basename(path))[0] + extension)
+        if os.path.abspath(output) == os.path.abspath(path):
+            print(f"{path}: girdi ile aynı dosya, atlandı", file=sys.stderr)
+            failed += 1
+            continue
+
+        started = time.perf_counter()
+        try:
+            os.makedirs(directory or ".", exist_ok=True)
+            count = export_records(iter_conversation_records(path), output, exporter())
+        except (OSError, ValueError) as e:
+            print(f"{path}: HATA: {e}", file=sys.stderr)
+            failed += 1
+            continue
+        print(f"{path} -> {output}: {count} mesaj, {time.perf_counter() - started:.2f} sn", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="cli.py", description="Ollama AI Chat komut satırı araçları")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    search = commands.add_parser("search", help="Kaydedilmiş konuşmalarda ara")
+    search.add_argument("query", nargs="+", help="Aranacak kelimeler")
+    search.add_argument("--dir", dest="dirs", action="append", help="Taranacak klasör (tekrarlanabilir)")
+    search.add_argument("--limit", type=int, default=10, help="En fazla sonuç sayısı")
+    search.set_defaults(func=search_command)
+
+    batch = commands.add_parser("batch", help="JSONL istem dosyasını pencere olmadan çalıştır")
+    batch.add_argument("input", help='Her satırda {"prompt": ...} veya {"messages": [...]} olan JSONL dosyası')
+    batch.add_argument("-o", "--output", required=True, help="Sonuçların yazılacağı JSONL dosyası")
+    batch.add_argument("-m", "--model", default="deepseek-r1:14b", help="Satırda model yoksa kullanılacak model")
+    batch.add_argument("-c", "--concurrency", type=int, default=2, help="Aynı anda gönderilecek istek sayısı")
+    batch.add_argument("--resume", action="store_true", help="Çıktıda tamamlanmış satırları atla")
+    batch.add_argument("--cache", action="store_true", help="Yanıt önbelleğini kullan")
+    batch.set_defaults(func=batch_command)
+
+    from services.exporters import EXPORTERS
+
+    export = commands.add_parser("export", help="Kaydedilmiş konuşmaları başka biçime dönüştür")
+    export.add_argument("inputs", nargs="+", help="Kaydedilmiş .json veya günlük .jsonl dosyaları")
+    export.add_argument(
+        "-f", "--format", required=True, choices=[extension[1:] for extension in EXPORTERS], help="Çıktı biçimi"
+    )
+    export.add_argument("-o", "--output-dir", help="Çıktı klasörü (varsayılan: girdinin klasörü)")
+    export.set_defaults(func=export_command)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
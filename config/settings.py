@@ -0,0 +1,54 @@
+import os
+
+# Rendering
+RENDER_FPS = int(os.environ.get("OLLAMA_THINK_RENDER_FPS", "30"))  # Max UI flushes per second while streaming
+
+# Context window
+CONTEXT_TOKEN_BUDGET = int(os.environ.get("OLLAMA_THINK_CONTEXT_TOKENS", "3072"))  # Prompt tokens sent per request
+CONTEXT_STRATEGY = os.environ.get("OLLAMA_THINK_CONTEXT_STRATEGY", "sliding")  # "sliding", "summary" or "retrieval"
+SUMMARY_MODEL = os.environ.get("OLLAMA_THINK_SUMMARY_MODEL", "llama3:8b")  # Cheap model for the summary strategy
+
+# Retrieval memory (the "retrieval" context strategy, needs NumPy)
+EMBEDDING_MODEL = os.environ.get("OLLAMA_THINK_EMBED_MODEL", "nomic-embed-text")
+RETRIEVAL_TOP_K = int(os.environ.get("OLLAMA_THINK_RETRIEVAL_TOP_K", "4"))  # Past turns recalled per request
+RETRIEVAL_QUERY_TIMEOUT = float(os.environ.get("OLLAMA_THINK_RETRIEVAL_TIMEOUT", "0.5"))  # Seconds a request waits for its query embedding before sending only recent turns
+
+# Model residency
+KEEP_ALIVE = os.environ.get("OLLAMA_THINK_KEEP_ALIVE", "5m")  # How long Ollama keeps a model loaded after use
+PINNED_KEEP_ALIVE = -1  # Keep the pinned model loaded until it is unpinned
+RESIDENCY_POLL_INTERVAL = float(os.environ.get("OLLAMA_THINK_PS_INTERVAL", "5"))  # Seconds between checks of the loaded models
+# Seconds a queued request may be passed over in favor of requests for already loaded models
+RESIDENCY_MAX_WAIT = float(os.environ.get("OLLAMA_THINK_MAX_WAIT", "30"))
+
+# Transport
+OLLAMA_HOST = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
+# Requests streamed at once; match the server's OLLAMA_NUM_PARALLEL slots
+MAX_CONCURRENT_REQUESTS = int(os.environ.get("OLLAMA_THINK_MAX_CONCURRENT", os.environ.get("OLLAMA_NUM_PARALLEL", "2")))
+REQUEST_QUEUE_SIZE = int(os.environ.get("OLLAMA_THINK_QUEUE_SIZE", "16"))  # Requests waiting for a free slot
+
+# Response cache
+APP_DATA_DIR = os.environ.get("OLLAMA_THINK_DATA_DIR", os.path.join(os.path.expanduser("~"), ".ollama_think"))
+RESPONSE_CACHE_ENABLED = os.environ.get("OLLAMA_THINK_CACHE", "1") == "1"
+RESPONSE_CACHE_DIR = os.path.join(APP_DATA_DIR, "response_cache")
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get("OLLAMA_THINK_CACHE_MAX_MB", "64")) * 1024 * 1024
+
+# Conversation journal
+JOURNAL_DIR = os.path.join(APP_DATA_DIR, "sessions")
+EXPORT_DIR = os.path.join(APP_DATA_DIR, "exports")  # Where Kaydet suggests saving
+HISTORY_PAGE_SIZE = int(os.environ.get("OLLAMA_THINK_HISTORY_PAGE", "50"))  # Turns loaded at a time from a journal
+
+# Search index
+SEARCH_INDEX_PATH = os.path.join(APP_DATA_DIR, "search_index.pickle")
+SEARCH_DIRS = [d for d in os.environ.get("OLLAMA_THINK_SEARCH_DIRS", "").split(os.pathsep) if d] or [JOURNAL_DIR, EXPORT_DIR]
+
+# Metrics
+METRICS_LOG = os.environ.get("OLLAMA_THINK_METRICS_LOG", "")  # .csv or .jsonl file to append per-response metrics to; empty disables
+METRICS_HISTORY = 500  # Responses kept per model for percentiles
+
+# Model catalog
+MODEL_CATALOG_PATH = os.path.join(APP_DATA_DIR, "models.json")
+MODEL_CATALOG_TTL = int(os.environ.get("OLLAMA_THINK_MODEL_TTL", str(24 * 3600)))  # Seconds before model details are fetched again
+
+# Compare mode
+# Models streamed at once; the rest wait so the server is not forced to swap models in and out
+COMPARE_MAX_MODELS = int(os.environ.get("OLLAMA_THINK_COMPARE_MODELS", os.environ.get("OLLAMA_MAX_LOADED_MODELS", "2")))
@@ -1,3 +1,17 @@
+# Code highlight colors by tag; code blocks use the same dark background in every theme
+SYNTAX_COLORS = {
+    "syn_keyword": "#bb9af7",
+    "syn_builtin": "#2ac3de",
+    "syn_function": "#7aa2f7",
+    "syn_class": "#e0af68",
+    "syn_decorator": "#ff9e64",
+    "syn_string": "#9ece6a",
+    "syn_number": "#ff9e64",
+    "syn_comment": "#565f89",
+    "syn_operator": "#89ddff",
+}
+
+
 class CustomTheme:
     def __init__(self):
         # Default to dark theme
@@ -12,6 +26,9 @@ class CustomTheme:
         self.think_fg = "#A6ADC8"  # Thinking text
         self.button_bg = "#89B4FA"  # Button background
         self.button_fg = "#1E1E2E"  # Button text
+        self.code_bg = "#1a1b26"  # Code block background
+        self.code_fg = "#7dcfff"  # Code block text
+        self.syntax_colors = SYNTAX_COLORS  # Code highlight colors
 
     def set_light_theme(self):
         """Switch to light theme"""
@@ -26,6 +43,9 @@ class CustomTheme:
         self.think_fg = "#666666"
         self.button_bg = "#1E88E5"
         self.button_fg = "#FFFFFF"
+        self.code_bg = "#1a1b26"
+        self.code_fg = "#7dcfff"
+        self.syntax_colors = SYNTAX_COLORS
 
     def set_dark_theme(self):
         """Switch to dark theme"""
@@ -39,4 +59,7 @@ class CustomTheme:
         self.think_bg = "#2A2A3C"
         self.think_fg = "#A6ADC8"
         self.button_bg = "#89B4FA"
-        self.button_fg = "#1E1E2E"
\ No newline at end of file
+        self.button_fg = "#1E1E2E"
+        self.code_bg = "#1a1b26"
+        self.code_fg = "#7dcfff"
+        self.syntax_colors = SYNTAX_COLORS
@@ -1,7 +1,60 @@
-import tkinter as tk
-from app import OllamaGUI
+import sys
+import time
+
+STARTED = time.perf_counter()
+
+
+class StartupProfile:
+    """Collect time-since-launch marks and print them once the app is usable"""
+
+    def __init__(self):
+        self.marks = []
+
+    def mark(self, label):
+        self.marks.append((label, time.perf_counter() - STARTED))
+
+    def report(self):
+        previous = 0.0
+        for label, elapsed in self.marks:
+            print(f"startup: {elapsed * 1000:8.1f} ms  (+{(elapsed - previous) * 1000:6.1f})  {label}", file=sys.stderr)
+            previous = elapsed
+        print("startup: import details: python -X importtime main.py --profile-startup", file=sys.stderr)
+
+
+def main():
+    # --profile-startup prints a timing report and exits once the client library is loaded
+    profile = StartupProfile() if "--profile-startup" in sys.argv else None
+
+    import tkinter as tk
+    from app import OllamaGUI
+    if profile:
+        profile.mark("modules imported")
 
-if __name__ == "__main__":
     root = tk.Tk()
+    if profile:
+        profile.mark("Tk root created")
+
     app = OllamaGUI(root)
-    root.mainloop()
\ No newline at end of file
+    if profile:
+        profile.mark("window built")
+
+        def on_first_idle():
+            root.update_idletasks()
+            profile.mark("window drawn")
+            wait_for_client()
+
+        def wait_for_client():
+            if not app.transport.ready.is_set():
+                root.after(5, wait_for_client)
+                return
+            profile.mark("Ollama client loaded (transport thread)")
+            profile.report()
+            app.on_close()
+
+        root.after_idle(on_first_idle)
+
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import json
+import os
+import threading
+
+from config.settings import KEEP_ALIVE
+from services.events import Done, Error
+from services.metrics import ResponseMetrics
+
+
+def read_jobs(path):
+    """Yield (line number, id, model, messages, error) for each non-empty input line
+
+    A line holds either {"prompt": "..."} or {"messages": [...]}, optionally
+    with "id" and "model". Lines that are not valid jobs come with an error
+    message and no messages, so one bad line does not stop the batch.
+    """
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            try:
+                record = json.loads(line)
+                if "messages" in record:
+                    messages = record["messages"]
+                else:
+                    messages = [{"role": "user", "content": record["prompt"]}]
+                job_id, model = record.get("id"), record.get("model")
+            except json.JSONDecodeError as e:
+                yield number, None, None, None, f"Geçersiz JSON: {e}"
+            except (KeyError, TypeError, AttributeError):
+                yield number, None, None, None, 'Satırda "prompt" ya da "messages" yok'
+            else:
+                yield number, job_id, model, messages, None
+
+
+def completed_lines(path):
+    """Input line numbers already answered in an existing output file"""
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # Last line cut short by the interruption; it is run again
+                continue
+            if "error" not in record:
+                done.add(record["line"])
+    return done
+
+
+class BatchRunner:
+    """Run prompt files through the transport and append one JSONL result per input line
+
+    At most `concurrency` requests are in flight; results are written in the
+    order they finish, each tagged with its input line number, and flushed
+    right away so an interrupted run can resume where it stopped.
+    """
+
+    def __init__(self, transport, model, output_path, concurrency, keep_alive=KEEP_ALIVE, cache=None, on_result=None):
+        self.transport = transport
+        self.model = model
+        self.output_path = output_path
+        self.keep_alive = keep_alive
+        self.cache = cache
+        self.on_result = on_result
+
+        self.slots = threading.BoundedSemaphore(concurrency)
+        self.lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+
+    def run(self, input_path, resume=False):
+        """Process every input line, skipping answered ones when resuming; returns (completed, failed)"""
+        skip = completed_lines(self.output_path) if resume else set()
+
+        with open(self.output_path, "a" if resume else "w", encoding="utf-8") as self.output:
+            futures = []
+            for number, job_id, model, messages, error in read_jobs(input_path):
+                if number in skip:
+                    continue
+                if error:
+                    self.write_result({"line": number, "error": error})
+                    continue
+
+                self.slots.acquire()
+                futures.append(self.submit(number, job_id, model or self.model, messages))
+
+            for future in futures:
+                future.result()
+
+        return self.completed, self.failed
+
+    def submit(self, number, job_id, model, messages):
+        metrics = ResponseMetrics(model)
+        outcome = []
+
+        def on_event(event):
+            metrics.observe(event)
+            if isinstance(event, (Done, Error)):
+                outcome.append(event)
+
+        # Supplied conversations are sent as they are; trimming them would change what is being evaluated
+        future = self.transport.stream_chat(model, messages, on_event, self.keep_alive, cache=self.cache)
+        future.add_done_callback(lambda f: self.finish(f, number, job_id, metrics, outcome))
+        return future
+
+    def finish(self, future, number, job_id, metrics, outcome):
+        # Runs on the transport thread
+        self.slots.release()
+
+        record = {"line": number}
+        if job_id is not None:
+            record["id"] = job_id
+        record["model"] = metrics.model
+
+        event = outcome[0] if outcome else None
+        if isinstance(event, Done):
+            record.update({
+                "thinking": event.thinking,
+                "answer": event.answer,
+                "stats": event.stats,
+                "ttft": metrics.ttft,
+                "ttfat": metrics.ttfat,
+                "wall_time": metrics.wall_time,
+                "cached": event.cached,
+            })
+        else:
+            error = event.error if event else future.exception()
+            record["error"] = str(error)
+
+        self.write_result(record)
+
+    def write_result(self, record):
+        with self.lock:
+            self.output.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self.output.flush()
+            if "error" in record:
+                self.failed += 1
+            else:
+                self.completed += 1
+
+        if self.on_result:
+            self.on_result(record)
@@ -0,0 +1,175 @@
+import threading
+
+from config.settings import CONTEXT_TOKEN_BUDGET, CONTEXT_STRATEGY, RETRIEVAL_TOP_K
+from services.conversation import Message, SYSTEM, ASSISTANT, count_tokens
+
+
+class ContextSelection:
+    """Messages chosen for one request and the token accounting behind them"""
+
+    __slots__ = ("messages", "sent_tokens", "dropped_tokens", "dropped_count")
+
+    def __init__(self, messages, sent_tokens, dropped_tokens, dropped_count):
+        self.messages = messages
+        self.sent_tokens = sent_tokens
+        self.dropped_tokens = dropped_tokens
+        self.dropped_count = dropped_count
+
+
+class SlidingWindowStrategy:
+    """Keep the newest turns that fit in the budget and drop the rest"""
+
+    def select(self, history, budget):
+        """Split a list of Messages into (kept, dropped) lists, oldest first"""
+        kept = []
+        used = 0
+
+        for message in reversed(history):
+            tokens = message.tokens
+            # The latest message is always sent, even if it alone exceeds the budget
+            if kept and used + tokens > budget:
+                break
+            kept.append(message)
+            used += tokens
+
+        kept.reverse()
+
+        # Do not start the window with a reply whose question was dropped
+        while len(kept) > 1 and kept[0].role == ASSISTANT:
+            kept.pop(0)
+
+        return kept, history[:len(history) - len(kept)]
+
+
+class SummaryStrategy(SlidingWindowStrategy):
+    """Sliding window that replaces dropped turns with a summary made in the background
+
+    summarize(messages, previous_summary) must return the summary text; it gets
+    API payload dicts and runs on a worker thread so requests never wait for it. Until the first summary
+    is ready, dropped turns are simply left out.
+    """
+
+    SUMMARY_SHARE = 4  # At most 1/4 of the budget goes to the summary
+
+    def __init__(self, summarize):
+        self.summarize = summarize
+        self.summary = ""
+        self.summarized_count = 0  # Number of leading history messages covered by the summary
+        self._lock = threading.Lock()
+        self._running = False
+
+    def select(self, history, budget):
+        # The summary and the count it covers change together on the summary thread
+        with self._lock:
+            summary, summarized_count = self.summary, self.summarized_count
+
+        summary_tokens = count_tokens(summary) if summary else 0
+        kept, dropped = super().select(history, budget - min(summary_tokens, budget // self.SUMMARY_SHARE))
+
+        if len(dropped) > summarized_count:
+            self._start_summary(dropped, summary, summarized_count)
+
+        if summary:
+            kept = [Message(SYSTEM, "Önceki konuşmanın özeti: " + summary)] + kept
+        return kept, dropped
+
+    def _start_summary(self, dropped, summary, summarized_count):
+        with self._lock:
+            if self._running:
+                return
+            self._running = True
+
+        new_messages = [message.to_payload() for message in dropped[summarized_count:]]
+        threading.Thread(
+            target=self._run_summary, args=(new_messages, summary, len(dropped)), daemon=True
+        ).start()
+
+    def _run_summary(self, messages, previous_summary, covered_count):
+        try:
+            summary = self.summarize(messages, previous_summary)
+        except Exception:
+            # Keep the previous summary; the next request retries
+            summary = None
+
+        with self._lock:
+            if summary is not None:
+                self.summary = summary
+                self.summarized_count = covered_count
+            self._running = False
+
+
+class RetrievalStrategy(SlidingWindowStrategy):
+    """Sliding window plus the dropped turns most similar to the latest message
+
+    memory is a RetrievalMemory that embeds the turns in the background; every
+    turn added to the conversation must be passed to memory.remember().
+    Recalled turns are sent in their original order, before the window.
+    """
+
+    RECALL_SHARE = 3  # At most 1/3 of the budget goes to recalled turns
+
+    def __init__(self, memory, top_k=RETRIEVAL_TOP_K):
+        self.memory = memory
+        self.top_k = top_k
+
+    def select(self, history, budget):
+        recall_budget = budget // self.RECALL_SHARE
+        kept, dropped = super().select(history, budget - recall_budget)
+
+        if not dropped:
+            return kept, dropped
+
+        chosen = []
+        used = 0
+        for position in self.memory.relevant(history[-1].content, dropped, self.top_k):
+            tokens = dropped[position].tokens
+            if used + tokens <= recall_budget:
+                chosen.append(position)
+                used += tokens
+
+        if not chosen:
+            return kept, dropped
+
+        chosen.sort()
+        recalled = [dropped[position] for position in chosen]
+        skipped = set(chosen)
+        return recalled + kept, [m for position, m in enumerate(dropped) if position not in skipped]
+
+
+class ContextWindow:
+    """Fit the conversation into a token budget before it is sent"""
+
+    def __init__(self, budget=CONTEXT_TOKEN_BUDGET, strategy=None):
+        self.budget = budget
+        self.strategy = strategy or SlidingWindowStrategy()
+
+    def build(self, conversation):
+        """Return the ContextSelection to send for a Conversation (or a snapshot of one)"""
+        # System prompts are always kept and count against the budget first
+        system = [m for m in conversation if m.role == SYSTEM]
+        history = [m for m in conversation if m.role != SYSTEM]
+        system_tokens = sum(m.tokens for m in system)
+
+        kept, dropped = self.strategy.select(history, max(0, self.budget - system_tokens))
+        selected = system + kept
+
+        return ContextSelection(
+            [m.to_payload() for m in selected],
+            sum(m.tokens for m in selected),
+            sum(m.tokens for m in dropped),
+            len(dropped),
+        )
+
+
+def create_context_window(summarize=None, strategy=CONTEXT_STRATEGY, memory=None):
+    """Create the configured context window
+
+    summarize is required for the summary strategy and a RetrievalMemory
+    for the retrieval strategy; without them the sliding window is used.
+    """
+    if strategy == "summary" and summarize:
+        return ContextWindow(strategy=SummaryStrategy(summarize))
+    if strategy == "retrieval" and memory:
+        return ContextWindow(strategy=RetrievalStrategy(memory))
+    return ContextWindow()
+
@@ -0,0 +1,157 @@
+import sys
+from datetime import datetime
+
+MESSAGE_OVERHEAD = 4  # Tokens the chat template adds around every message
+
+SYSTEM = sys.intern("system")
+USER = sys.intern("user")
+ASSISTANT = sys.intern("assistant")
+
+
+def count_tokens(text):
+    """Cheap token estimate (~4 characters per token)"""
+    return (len(text) + 3) // 4 + MESSAGE_OVERHEAD
+
+
+def intern_role(role):
+    """Share one string object per role across all messages"""
+    return sys.intern(role)
+
+
+def parse_timestamp(value):
+    """Datetime of a saved timestamp, or None"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class Message:
+    """One turn of a conversation, also used as the transcript item that displays it
+
+    Besides the text it keeps the thinking, timestamp and model, a cached
+    token count, and the rendered height the transcript measured for it.
+    """
+
+    __slots__ = ("role", "content", "thinking", "timestamp", "model", "truncated", "complete", "info",
+                 "height", "measured", "_tokens")
+
+    def __init__(self, role, content="", thinking="", timestamp=None, model=None, truncated=False, complete=True,
+                 info=""):
+        self.role = intern_role(role)
+        self.content = content
+        self.thinking = thinking
+        self.timestamp = timestamp
+        self.model = model
+        self.truncated = truncated
+        self.complete = complete  # False while the reply is streaming
+        self.info = info  # Extra header note, e.g. metrics or that the reply came from the cache
+
+        # Set by the transcript: an estimate until the message has been rendered once
+        self.height = 0
+        self.measured = False
+        self._tokens = None
+
+    @property
+    def tokens(self):
+        """Estimated token count, computed once the content is final"""
+        if self._tokens is None or not self.complete:
+            self._tokens = count_tokens(self.content)
+        return self._tokens
+
+    def to_payload(self):
+        """Dict sent to the chat API"""
+        return {"role": self.role, "content": self.content}
+
+    def to_record(self):
+        """Dict written to journals and saved files; empty fields are left out"""
+        record = {"role": self.role, "content": self.content}
+        if self.timestamp:
+            record["timestamp"] = self.timestamp.isoformat()
+        if self.model:
+            record["model"] = self.model
+        if self.thinking:
+            record["thinking"] = self.thinking
+        if self.truncated:
+            record["truncated"] = True
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        """Message from a journal or saved-file record (also accepts plain API dicts)"""
+        return cls(
+            record["role"],
+            record.get("content", ""),
+            thinking=record.get("thinking", ""),
+            timestamp=parse_timestamp(record.get("timestamp")),
+            model=record.get("model"),
+            truncated=record.get("truncated", False),
+        )
+
+
+class ConversationView:
+    """Read-only snapshot of a conversation, safe to hand to another thread
+
+    Conversations only ever append to their list in place and replace it for
+    any other change, so a view is just the list and its length at the time.
+    """
+
+    __slots__ = ("_messages", "_length")
+
+    def __init__(self, messages, length):
+        self._messages = messages
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        messages = self._messages
+        for i in range(self._length):
+            yield messages[i]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._messages[i] for i in range(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError(index)
+        return self._messages[index]
+
+
+class Conversation:
+    """Ordered messages of one chat session"""
+
+    def __init__(self, messages=None):
+        self._messages = list(messages or ())
+
+    @classmethod
+    def from_records(cls, records):
+        return cls(Message.from_record(record) for record in records)
+
+    def __len__(self):
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def __getitem__(self, index):
+        return self._messages[index]
+
+    def append(self, message):
+        self._messages.append(message)
+        return message
+
+    def add(self, role, content, **fields):
+        """Append a new message and return it"""
+        return self.append(Message(role, content, **fields))
+
+    def prepend(self, messages):
+        """Insert older messages at the start"""
+        # A new list, so snapshots taken before keep seeing the old one
+        self._messages = list(messages) + self._messages
+
+    def snapshot(self):
+        """O(1) read-only view of the messages as they are now"""
+        return ConversationView(self._messages, len(self._messages))
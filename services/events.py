@@ -0,0 +1,78 @@
+# Timing fields reported by Ollama on the final chunk of a response
+STAT_FIELDS = (
+    "total_duration",
+    "load_duration",
+    "prompt_eval_count",
+    "prompt_eval_duration",
+    "eval_count",
+    "eval_duration",
+)
+
+
+class Started:
+    """The request left the queue and is about to be sent, with its context built"""
+
+    __slots__ = ()
+
+    def __repr__(self):
+        return "Started()"
+
+
+class ThinkingDelta:
+    """Chunk of the model's reasoning (text inside <think> tags)"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __repr__(self):
+        return f"ThinkingDelta({self.text!r})"
+
+
+class AnswerDelta:
+    """Chunk of the visible answer"""
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __repr__(self):
+        return f"AnswerDelta({self.text!r})"
+
+
+class Done:
+    """End of a response with the full texts and Ollama's timing stats
+
+    truncated is set when the request was cancelled; the texts then hold what
+    had been generated so far. cached is set when the response was replayed
+    from the response cache instead of being generated.
+    """
+
+    __slots__ = ("answer", "thinking", "stats", "truncated", "cached")
+
+    def __init__(self, answer, thinking, stats, truncated=False, cached=False):
+        self.answer = answer
+        self.thinking = thinking
+        self.stats = stats
+        self.truncated = truncated
+        self.cached = cached
+
+    def __repr__(self):
+        return (
+            f"Done(answer={len(self.answer)} chars, thinking={len(self.thinking)} chars, "
+            f"stats={self.stats}, truncated={self.truncated}, cached={self.cached})"
+        )
+
+
+class Error:
+    """The request failed; no further events follow"""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error):
+        self.error = error
+
+    def __repr__(self):
+        return f"Error({self.error!r})"
@@ -0,0 +1,178 @@
+import html
+import json
+import os
+from abc import ABC, abstractmethod
+
+from services.conversation import parse_timestamp
+from utils.markdown_stream import parse_segments
+
+PROGRESS_EVERY = 200  # Records written between progress callbacks
+
+ROLE_TITLES = {"user": "Kullanıcı", "assistant": "Asistan", "system": "Sistem"}
+
+HTML_STYLE = """
+body { font-family: "Segoe UI", sans-serif; background: #1E1E2E; color: #CDD6F4; max-width: 900px; margin: 2em auto; }
+.turn { border-radius: 8px; padding: 10px 15px; margin: 10px 0; background: #313244; }
+.turn.user { background: #45475A; color: #FFFFFF; margin-left: 15%; }
+.turn.system { background: none; color: #A6ADC8; font-style: italic; text-align: center; }
+.meta { font-size: 0.8em; color: #89B4FA; margin-bottom: 5px; }
+details { color: #A6ADC8; font-style: italic; margin-bottom: 8px; }
+pre { background: #1a1b26; color: #7dcfff; padding: 10px; border-radius: 5px; overflow-x: auto; }
+"""
+
+
+def turn_heading(record):
+    """Role, time and model of a record as one line"""
+    parts = [ROLE_TITLES.get(record.get("role"), record.get("role", ""))]
+    timestamp = parse_timestamp(record.get("timestamp"))
+    if timestamp:
+        parts.append(timestamp.strftime("%Y-%m-%d %H:%M"))
+    if record.get("model"):
+        parts.append(record["model"])
+    if record.get("truncated"):
+        parts.append("durduruldu")
+    return " · ".join(parts)
+
+
+class Exporter(ABC):
+    """Writes conversation records to an open text file one at a time
+
+    Subclasses set extension and override write_record, plus begin and end
+    for formats with a header or footer. Nothing is kept between records,
+    so exports of any size use constant memory.
+    """
+
+    extension = ""
+    description = ""
+
+    def begin(self, f, title):
+        pass
+
+    @abstractmethod
+    def write_record(self, f, record):
+        pass
+
+    def end(self, f):
+        pass
+
+
+class JsonExporter(Exporter):
+    """JSON list of records, the format Kaydet has always written and Yükle reads"""
+
+    extension = ".json"
+    description = "JSON"
+
+    def begin(self, f, title):
+        self.first = True
+        f.write("[")
+
+    def write_record(self, f, record):
+        f.write("\n  " if self.first else ",\n  ")
+        f.write(json.dumps(record, ensure_ascii=False))
+        self.first = False
+
+    def end(self, f):
+        f.write("\n]\n")
+
+
+class JsonlExporter(Exporter):
+    """One record per line, the same format as session journals"""
+
+    extension = ".jsonl"
+    description = "JSON Lines"
+
+    def write_record(self, f, record):
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class MarkdownExporter(Exporter):
+    """Markdown with a heading per turn; replies keep their fenced code blocks"""
+
+    extension = ".md"
+    description = "Markdown"
+
+    def begin(self, f, title):
+        f.write(f"# {title}\n")
+
+    def write_record(self, f, record):
+        f.write(f"\n## {turn_heading(record)}\n\n")
+        if record.get("thinking"):
+            f.write("<details><summary>Düşünme süreci</summary>\n\n")
+            f.write(record["thinking"].strip() + "\n\n</details>\n\n")
+        f.write(record.get("content", "").strip() + "\n")
+
+
+class HtmlExporter(Exporter):
+    """Single self-contained HTML page with inline styles"""
+
+    extension = ".html"
+    description = "HTML"
+
+    def begin(self, f, title):
+        f.write(
+            f'<!DOCTYPE html>\n<html lang="tr">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{html.escape(title)}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n"
+            f"<h1>{html.escape(title)}</h1>\n"
+        )
+
+    def write_record(self, f, record):
+        role = html.escape(record.get("role", ""))
+        f.write(f'<div class="turn {role}">\n<div class="meta">{html.escape(turn_heading(record))}</div>\n')
+        if record.get("thinking"):
+            f.write(f"<details><summary>Düşünme süreci</summary>{_paragraphs(record['thinking'])}</details>\n")
+
+        for kind, content, language in parse_segments(record.get("content", "")):
+            if kind == "code":
+                language_class = f' class="language-{html.escape(language)}"' if language else ""
+                f.write(f"<pre><code{language_class}>{html.escape(content)}</code></pre>\n")
+            elif content.strip():
+                f.write(_paragraphs(content) + "\n")
+        f.write("</div>\n")
+
+    def end(self, f):
+        f.write("</body>\n</html>\n")
+
+
+def _paragraphs(text):
+    blocks = [block.strip() for block in text.split("\n\n") if block.strip()]
+    return "".join(f"<p>{html.escape(block).replace(chr(10), '<br>')}</p>" for block in blocks)
+
+
+# Exporters by file extension
+EXPORTERS = {exporter.extension: exporter for exporter in (JsonExporter, JsonlExporter, MarkdownExporter, HtmlExporter)}
+
+
+def exporter_for(path):
+    """Exporter instance for a file name's extension, or None if there is none"""
+    exporter = EXPORTERS.get(os.path.splitext(path)[1].lower())
+    return exporter() if exporter else None
+
+
+def export_records(records, path, exporter=None, title=None, progress=None):
+    """Stream records into path and return how many were written
+
+    The file is written under a temporary name and renamed at the end, so
+    a failed export never leaves a half-written file behind. progress(count)
+    is called every PROGRESS_EVERY records, on the calling thread.
+    """
+    exporter = exporter or exporter_for(path)
+    if exporter is None:
+        raise ValueError(f"Desteklenmeyen dosya türü: {os.path.basename(path)}")
+
+    temp_path = path + ".tmp"
+    count = 0
+    try:
+        with open(temp_path, "w", encoding="utf-8") as f:
+            exporter.begin(f, title or os.path.splitext(os.path.basename(path))[0])
+            for record in records:
+                exporter.write_record(f, record)
+                count += 1
+                if progress and count % PROGRESS_EVERY == 0:
+                    progress(count)
+            exporter.end(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
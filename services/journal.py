@@ -0,0 +1,247 @@
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+from config.settings import JOURNAL_DIR, HISTORY_PAGE_SIZE
+
+READ_BLOCK_SIZE = 64 * 1024
+
+
+class BackgroundWriter:
+    """Single thread that performs file writes in submission order, off the Tk thread"""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="journal-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            func, on_done = job
+            try:
+                func()
+                error = None
+            except Exception as e:
+                error = e
+            if on_done:
+                on_done(error)
+
+    def submit(self, func, on_done=None):
+        """Run func() on the writer thread; on_done(error) is called there afterwards"""
+        self.jobs.put((func, on_done))
+
+    def close(self):
+        """Finish pending writes and stop the thread"""
+        self.jobs.put(None)
+        self.thread.join(timeout=5)
+
+
+def new_journal_path(directory=JOURNAL_DIR):
+    """Path of a fresh journal file named after the current time"""
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    return os.path.join(directory, f"session_{stamp}.jsonl")
+
+
+class SessionJournal:
+    """Append-only JSONL file with one record per completed turn"""
+
+    def __init__(self, path, writer):
+        self.path = path
+        self.writer = writer
+
+        # A journal cut off mid-line by a crash gets its next record on a fresh line
+        self.needs_newline = False
+        if os.path.exists(path) and os.path.getsize(path):
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                self.needs_newline = f.read(1) != b"\n"
+
+    def append(self, record):
+        """Queue a record to be appended; returns immediately"""
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        if self.needs_newline:
+            line = "\n" + line
+            self.needs_newline = False
+
+        def write():
+            # Reopened per turn so every completed turn is on disk right away
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+        self.writer.submit(write)
+
+
+def read_records_before(path, end, count, block_size=READ_BLOCK_SIZE):
+    """Read up to count records ending at byte offset end, scanning backwards
+
+    Returns (records, start) where start is the offset of the first record
+    returned, to be passed as end for the next older page. Only the blocks
+    holding those records are read, whatever the size of the file.
+    """
+    with open(path, "rb") as f:
+        pos = end
+        data = b""
+        while pos > 0 and data.count(b"\n") <= count:
+            size = min(block_size, pos)
+            pos -= size
+            f.seek(pos)
+            data = f.read(size) + data
+
+    lines = data.split(b"\n")
+    if pos > 0:
+        # The first piece may be the tail of an older line; leave it for the next page
+        pos += len(lines[0]) + 1
+        lines = lines[1:]
+
+    offsets = []
+    offset = pos
+    for line in lines:
+        if line.strip():
+            offsets.append((offset, line))
+        offset += len(line) + 1
+
+    page = offsets[-count:] if count else []
+    records = []
+    for _, line in page:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            # A line cut short by a crash while it was being written
+            continue
+
+    start = page[0][0] if page else pos
+    return records, start
+
+
+class JournalReader:
+    """Pages through a journal from the newest turn backwards"""
+
+    def __init__(self, path, page_size=HISTORY_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self.end = os.path.getsize(path)
+
+    @property
+    def exhausted(self):
+        return self.end <= 0
+
+    def older_page(self):
+        """Return the next page of older records in chronological order"""
+        if self.exhausted:
+            return []
+
+        records, self.end = read_records_before(self.path, self.end, self.page_size)
+        return records
+
+
+class ExportReader:
+    """Pages through a conversation saved with Kaydet from the newest turn backwards
+
+    The JSON list is parsed record by record on the first call, so like
+    JournalReader's, older_page should be called off the Tk thread.
+    """
+
+    def __init__(self, path, page_size=HISTORY_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self.records = None  # Parsed on the first call; pages are removed as they are returned
+        self.exhausted = False
+
+    def older_page(self):
+        """Return the next page of older records in chronological order"""
+        if self.exhausted:
+            return []
+
+        if self.records is None:
+            self.records = list(iter_saved_records(self.path))
+
+        start = max(0, len(self.records) - self.page_size)
+        page = self.records[start:]
+        del self.records[start:]
+        self.exhausted = not self.records
+        return page
+
+
+def open_history_reader(path):
+    """Reader paging through a journal (.jsonl) or a saved export (.json)"""
+    if path.endswith(".jsonl"):
+        return JournalReader(path)
+    return ExportReader(path)
+
+
+def iter_journal_records(path, start=0):
+    """Yield (end_offset, record) for each complete record after byte offset start"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        for line in f:
+            if not line.endswith(b"\n"):
+                # Still being written; picked up on the next pass
+                break
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                yield offset, json.loads(line)
+            except ValueError:
+                continue
+
+
+def iter_saved_records(path, block_size=READ_BLOCK_SIZE):
+    """Yield the records of a saved export (.json list) one at a time without loading the whole file"""
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as f:
+        buffer = ""
+        position = 0
+        started = False
+        at_eof = False
+        read_size = block_size
+
+        while True:
+            # Skip whitespace and the list punctuation between records
+            while position < len(buffer) and buffer[position] in " \t\r\n,[]":
+                if buffer[position] == "[":
+                    started = True
+                elif buffer[position] == "]":
+                    return
+                position += 1
+
+            if position < len(buffer):
+                if not started:
+                    raise ValueError(f"{path}: JSON listesi değil")
+                try:
+                    record, end = decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if at_eof:
+                        raise
+                    record = None
+                if record is not None:
+                    yield record
+                    position = end
+                    read_size = block_size
+                    continue
+                # The record continues past the buffer; read more, doubling so huge records stay linear
+                read_size *= 2
+            elif at_eof:
+                return
+
+            chunk = f.read(read_size)
+            at_eof = not chunk
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def iter_conversation_records(path):
+    """Yield the records of a journal (.jsonl) or a saved export (.json)"""
+    if path.endswith(".jsonl"):
+        for _, record in iter_journal_records(path):
+            yield record
+    else:
+        yield from iter_saved_records(path)
@@ -0,0 +1,219 @@
+import csv
+import io
+import os
+import json
+import time
+from collections import deque
+from datetime import datetime
+
+from config.settings import METRICS_LOG, METRICS_HISTORY
+from services.events import Started, ThinkingDelta, AnswerDelta, Done
+
+NS = 1e9
+
+# Columns of the metrics log, in order
+LOG_FIELDS = (
+    "time",
+    "model",
+    "ttft",
+    "ttfat",
+    "wall_time",
+    "eval_count",
+    "eval_rate",
+    "prompt_eval_count",
+    "prompt_eval_rate",
+    "load_duration",
+    "total_duration",
+    "truncated",
+    "cached",
+)
+
+
+class ResponseMetrics:
+    """Client-side timings of one response plus the stats Ollama reports at the end
+
+    observe() is called with every event as it arrives on the transport
+    thread, so the timings do not include render batching. The clock
+    restarts at the Started event, so time spent waiting in the request
+    queue or building the context is not counted.
+    """
+
+    __slots__ = ("model", "started", "first_token", "first_answer", "finished", "stats", "truncated", "cached")
+
+    def __init__(self, model):
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token = None
+        self.first_answer = None
+        self.finished = None
+        self.stats = {}
+        self.truncated = False
+        self.cached = False
+
+    def observe(self, event):
+        now = time.perf_counter()
+        if isinstance(event, Started):
+            self.started = now
+        elif isinstance(event, (ThinkingDelta, AnswerDelta)) and self.first_token is None:
+            self.first_token = now
+        if isinstance(event, AnswerDelta) and self.first_answer is None:
+            self.first_answer = now
+        elif isinstance(event, Done):
+            self.finished = now
+            self.stats = event.stats
+            self.truncated = event.truncated
+            self.cached = event.cached
+
+    def _since_start(self, moment):
+        return moment - self.started if moment is not None else None
+
+    @property
+    def ttft(self):
+        """Seconds from sending to the first token, thinking included"""
+        return self._since_start(self.first_token)
+
+    @property
+    def ttfat(self):
+        """Seconds from sending to the first answer token, after the thinking"""
+        return self._since_start(self.first_answer)
+
+    @property
+    def wall_time(self):
+        return self._since_start(self.finished)
+
+    @property
+    def eval_rate(self):
+        """Generated tokens per second as measured by the server"""
+        return _rate(self.stats.get("eval_count"), self.stats.get("eval_duration"))
+
+    @property
+    def prompt_eval_rate(self):
+        return _rate(self.stats.get("prompt_eval_count"), self.stats.get("prompt_eval_duration"))
+
+    def header_text(self):
+        """Compact summary for the AI message header"""
+        parts = []
+        if self.ttft is not None:
+            parts.append(f"ilk token {self.ttft:.2f} sn")
+        if self.ttfat is not None and self.ttfat - self.ttft >= 0.01:
+            parts.append(f"yanıt {self.ttfat:.2f} sn")
+        if self.eval_rate:
+            parts.append(f"{self.eval_rate:.1f} token/sn")
+        if self.stats.get("prompt_eval_count"):
+            parts.append(f"istem {self.stats['prompt_eval_count']} token")
+        if self.stats.get("load_duration", 0) >= 0.1 * NS:
+            parts.append(f"yükleme {self.stats['load_duration'] / NS:.1f} sn")
+        return " · ".join(parts)
+
+    def to_record(self):
+        """Flat dict with the LOG_FIELDS columns"""
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "model": self.model,
+            "ttft": _round(self.ttft),
+            "ttfat": _round(self.ttfat),
+            "wall_time": _round(self.wall_time),
+            "eval_count": self.stats.get("eval_count"),
+            "eval_rate": _round(self.eval_rate),
+            "prompt_eval_count": self.stats.get("prompt_eval_count"),
+            "prompt_eval_rate": _round(self.prompt_eval_rate),
+            "load_duration": _round(self.stats.get("load_duration", 0) / NS),
+            "total_duration": _round(self.stats.get("total_duration", 0) / NS),
+            "truncated": self.truncated,
+            "cached": self.cached,
+        }
+
+
+def _rate(count, duration_ns):
+    if not count or not duration_ns:
+        return None
+    return count / (duration_ns / NS)
+
+
+def _round(value):
+    return round(value, 4) if value is not None else None
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers, or None"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelStats:
+    """Running aggregate of the responses generated by one model"""
+
+    def __init__(self, model, history=METRICS_HISTORY):
+        self.model = model
+        self.count = 0
+        self.tokens = 0
+        self.ttfts = deque(maxlen=history)
+        self.eval_rates = deque(maxlen=history)
+        self.prompt_rates = deque(maxlen=history)
+
+    def add(self, metrics):
+        self.count += 1
+        self.tokens += metrics.stats.get("eval_count", 0)
+        if metrics.ttft is not None:
+            self.ttfts.append(metrics.ttft)
+        if metrics.eval_rate:
+            self.eval_rates.append(metrics.eval_rate)
+        if metrics.prompt_eval_rate:
+            self.prompt_rates.append(metrics.prompt_eval_rate)
+
+    def mean_eval_rate(self):
+        return sum(self.eval_rates) / len(self.eval_rates) if self.eval_rates else None
+
+    def mean_prompt_rate(self):
+        return sum(self.prompt_rates) / len(self.prompt_rates) if self.prompt_rates else None
+
+
+class MetricsStore:
+    """Per-model aggregates for the stats view, optionally appended to a CSV or JSONL log
+
+    Log writes go through a BackgroundWriter so the Tk thread never touches
+    the file. Replies served from the response cache are logged but not
+    aggregated, since no tokens were generated for them.
+    """
+
+    def __init__(self, writer=None, log_path=METRICS_LOG):
+        self.writer = writer
+        self.log_path = log_path
+        self.models = {}
+        self.listeners = []
+
+    def record(self, metrics):
+        if not metrics.cached:
+            stats = self.models.get(metrics.model)
+            if stats is None:
+                stats = self.models[metrics.model] = ModelStats(metrics.model)
+            stats.add(metrics)
+
+        if self.log_path and self.writer:
+            record = metrics.to_record()
+            self.writer.submit(lambda: append_log(self.log_path, record))
+
+        for listener in self.listeners:
+            listener()
+
+
+def append_log(path, record):
+    """Append one metrics record to a .csv (with header on creation) or .jsonl file"""
+    if path.endswith(".csv"):
+        buffer = io.StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=LOG_FIELDS)
+        try:
+            new_file = not os.path.getsize(path)
+        except OSError:
+            new_file = True
+        if new_file:
+            writer.writeheader()
+        writer.writerow(record)
+        line = buffer.getvalue()
+    else:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+
+    with open(path, "a", encoding="utf-8", newline="") as f:
+        f.write(line)
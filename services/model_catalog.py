@@ -0,0 +1,130 @@
+import asyncio
+import json
+import os
+import time
+
+from config.settings import MODEL_CATALOG_PATH, MODEL_CATALOG_TTL
+
+# Name fragments of models known to emit <think> blocks, for servers that do not report capabilities
+REASONING_MODELS = ("deepseek-r1", "qwq", "qwen3", "magistral", "gpt-oss", "phi4-reasoning", "cogito")
+
+
+class ModelInfo:
+    """Details of one installed model, as cached on disk"""
+
+    __slots__ = ("name", "digest", "size", "family", "parameter_size", "quantization", "context_length",
+                 "thinking", "fetched")
+
+    def __init__(self, name, digest=None, size=None, family=None, parameter_size=None, quantization=None,
+                 context_length=None, thinking=False, fetched=0.0):
+        self.name = name
+        self.digest = digest
+        self.size = size
+        self.family = family
+        self.parameter_size = parameter_size
+        self.quantization = quantization
+        self.context_length = context_length
+        self.thinking = thinking
+        self.fetched = fetched
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{name: data[name] for name in cls.__slots__ if name in data})
+
+
+def is_reasoning_model(name, shown=None):
+    """Whether a model emits thinking, from its reported capabilities, its template or its name
+
+    Older servers list capabilities without "thinking" even for reasoning
+    models, so its absence falls through to the other checks.
+    """
+    if shown is not None:
+        if shown.capabilities and "thinking" in shown.capabilities:
+            return True
+        if shown.template and "<think>" in shown.template:
+            return True
+    return any(marker in name for marker in REASONING_MODELS)
+
+
+def model_info(entry, shown):
+    """Build a ModelInfo from a list entry and its show() response (None if that failed)"""
+    details = (shown.details if shown is not None else None) or entry.details
+    context_length = None
+    if shown is not None and shown.modelinfo:
+        context_length = next(
+            (value for key, value in shown.modelinfo.items() if key.endswith(".context_length")), None
+        )
+
+    return ModelInfo(
+        entry.model,
+        digest=entry.digest,
+        size=int(entry.size) if entry.size is not None else None,
+        family=details.family if details else None,
+        parameter_size=details.parameter_size if details else None,
+        quantization=details.quantization_level if details else None,
+        context_length=context_length,
+        thinking=is_reasoning_model(entry.model, shown),
+        # A failed show() is retried on the next refresh
+        fetched=time.time() if shown is not None else 0.0,
+    )
+
+
+class ModelCatalog:
+    """Installed models and their details, cached on disk between runs
+
+    The cached list is available immediately at startup; refresh() asks the
+    server for the current list and only fetches details of models that are
+    new, changed (different digest) or older than the TTL.
+    """
+
+    def __init__(self, path=MODEL_CATALOG_PATH, ttl=MODEL_CATALOG_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.models = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.models = {item["name"]: ModelInfo.from_dict(item) for item in data["models"]}
+        except (OSError, ValueError, KeyError, TypeError):
+            self.models = {}
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"models": [info.to_dict() for info in self.models.values()]}, f, ensure_ascii=False, indent=2)
+        os.replace(temp_path, self.path)
+
+    def names(self):
+        return sorted(self.models)
+
+    def get(self, name):
+        return self.models.get(name)
+
+    async def refresh(self, client):
+        """Update the catalog from the server; returns the sorted model names"""
+        listed = await client.list()
+        now = time.time()
+
+        models = {}
+        stale = []
+        for entry in listed.models:
+            cached = self.models.get(entry.model)
+            if cached and cached.digest == entry.digest and now - cached.fetched < self.ttl:
+                models[entry.model] = cached
+            else:
+                stale.append(entry)
+
+        shown = await asyncio.gather(*(client.show(entry.model) for entry in stale), return_exceptions=True)
+        for entry, result in zip(stale, shown):
+            models[entry.model] = model_info(entry, None if isinstance(result, Exception) else result)
+
+        self.models = models
+        await asyncio.to_thread(self.save)
+        return self.names()
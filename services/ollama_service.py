@@ -1,54 +1,113 @@
-from ollama import chat, ChatResponse
+import asyncio
 
+from ollama import Client, AsyncClient, ChatResponse
 
-def process_ollama_message(model, conversation, message_manager, root_widget, show_thinking):
-    """Process message with Ollama API and handle response streaming"""
-    # Initialize response tracking variables
-    ai_response = ""
-    thinking_text = ""
-    is_thinking = False
+from config.settings import OLLAMA_HOST, SUMMARY_MODEL, EMBEDDING_MODEL
+from services.events import ThinkingDelta, AnswerDelta, Done, Error, STAT_FIELDS
+from utils.think_splitter import ThinkTagSplitter, THINKING, ANSWER
 
-    # Send full conversation history
-    response: ChatResponse = chat(
-        model=model,
-        messages=conversation,
-        stream=True
-    )
 
-    for chunk in response:
-        content = chunk.message.content
+class ResponseAccumulator:
+    """Turn raw chat chunks into typed events and collect the full texts"""
+
+    def __init__(self):
+        self.splitter = ThinkTagSplitter()
+        self.answer_parts = []
+        self.thinking_parts = []
+        self.stats = {}
+
+    def feed(self, chunk: ChatResponse):
+        """Return the events carried by one streamed chunk"""
+        events = []
+
+        # Models run with think=True report reasoning in a separate field
+        thinking = getattr(chunk.message, "thinking", None)
+        if thinking:
+            self.thinking_parts.append(thinking)
+            events.append(ThinkingDelta(thinking))
+
+        for kind, text in self.splitter.feed(chunk.message.content or ""):
+            events.append(self._delta(kind, text))
+
+        if chunk.done:
+            self.stats = {name: getattr(chunk, name) for name in STAT_FIELDS if getattr(chunk, name, None) is not None}
+
+        return events
+
+    def finish(self, truncated=False):
+        """Return the events that close the response"""
+        events = [self._delta(kind, text) for kind, text in self.splitter.close()]
+        events.append(Done("".join(self.answer_parts), "".join(self.thinking_parts), self.stats, truncated))
+        return events
+
+    def _delta(self, kind, text):
+        if kind == THINKING:
+            self.thinking_parts.append(text)
+            return ThinkingDelta(text)
+        self.answer_parts.append(text)
+        return AnswerDelta(text)
 
-        # Check for thinking process
-        if "<think>" in content and not is_thinking:
-            is_thinking = True
-            thinking_text = content.replace("<think>", "")
-            if show_thinking:
-                root_widget.after(0, lambda t=thinking_text: message_manager.add_thinking_message(t))
 
-        elif is_thinking and "</think>" in content:
-            # End of thinking process
-            think_end = content.split("</think>")
-            thinking_text += think_end[0]
+def stream_chat_events(model, messages, keep_alive=None, client=None):
+    """Yield ThinkingDelta/AnswerDelta events, then Done or Error"""
+    client = client or Client(host=OLLAMA_HOST)
+    accumulator = ResponseAccumulator()
 
-            if show_thinking:
-                root_widget.after(0, lambda t=thinking_text: message_manager.add_thinking_message(t))
+    try:
+        for chunk in client.chat(model=model, messages=messages, stream=True, keep_alive=keep_alive):
+            yield from accumulator.feed(chunk)
+    except Exception as e:
+        yield Error(e)
+        return
 
-            is_thinking = False
+    yield from accumulator.finish()
 
-            # Start of normal response
-            if len(think_end) > 1:
-                ai_response = think_end[1]
-                root_widget.after(0, lambda r=ai_response: message_manager.add_ai_response(r))
 
-        elif is_thinking:
-            # Thinking continues
-            thinking_text += content
-            if show_thinking:
-                root_widget.after(0, lambda t=thinking_text: message_manager.add_thinking_message(t))
+async def astream_chat_events(model, messages, keep_alive=None, client=None):
+    """Async version of stream_chat_events"""
+    client = client or AsyncClient(host=OLLAMA_HOST)
+    accumulator = ResponseAccumulator()
+
+    try:
+        async for chunk in await client.chat(model=model, messages=messages, stream=True, keep_alive=keep_alive):
+            for event in accumulator.feed(chunk):
+                yield event
+    except asyncio.CancelledError:
+        # Leaving the stream closes the HTTP connection, which makes Ollama stop generating
+        for event in accumulator.finish(truncated=True):
+            yield event
+        raise
+    except Exception as e:
+        yield Error(e)
+        return
+
+    for event in accumulator.finish():
+        yield event
+
+
+async def warm_up_model(client, model, keep_alive=None):
+    """Load a model into memory without generating anything"""
+    # A chat request without messages only loads the model
+    await client.chat(model=model, messages=[], keep_alive=keep_alive)
+
+
+async def embed_texts(client, texts, model=EMBEDDING_MODEL):
+    """Embedding vectors of texts, one list of floats per text"""
+    response = await client.embed(model=model, input=texts)
+    return response.embeddings
+
+
+async def summarize_messages(client, messages, previous_summary="", model=SUMMARY_MODEL):
+    """Summarize older turns with a cheap model for the context window"""
+    transcript = "\n".join(f"{m['role']}: {m['content']}" for m in messages)
+    prompt = (
+        "Summarize the conversation below in a few sentences, keeping names, facts and decisions.\n"
+        f"Existing summary: {previous_summary or '-'}\n\n{transcript}"
+    )
 
-        else:
-            # Normal response
-            ai_response += content
-            root_widget.after(0, lambda r=ai_response: message_manager.add_ai_response(r))
+    response: ChatResponse = await client.chat(model=model, messages=[{"role": "user", "content": prompt}])
 
-    return ai_response
\ No newline at end of file
+    # Reasoning models wrap their notes in <think> tags; keep only the answer
+    splitter = ThinkTagSplitter()
+    parts = splitter.feed(response.message.content) + splitter.close()
+    return "".join(text for kind, text in parts if kind == ANSWER).strip()
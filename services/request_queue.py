@@ -0,0 +1,63 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+
+from config.settings import RESIDENCY_MAX_WAIT
+
+
+class FairRequestQueue:
+    """Bounded asyncio queue that hands out requests round-robin across keys
+
+    Each key (e.g. a chat session) has its own FIFO. After a key is served it
+    moves to the back, so a session with many queued requests cannot starve
+    the others. With is_resident(model), keys whose next request is for a
+    model the server already holds go first, which avoids swapping models in
+    and out; a request passed over for max_wait seconds is served next
+    regardless. Must only be used from the transport's event loop.
+    """
+
+    def __init__(self, maxsize, is_resident=None, max_wait=RESIDENCY_MAX_WAIT):
+        self.maxsize = maxsize
+        self.is_resident = is_resident
+        self.max_wait = max_wait
+        self.queues = OrderedDict()  # Key -> deque of (item, model, enqueue time), in serving order
+        self.size = 0
+        self._not_empty = asyncio.Event()
+
+    def put_nowait(self, key, item, model=None):
+        if self.size >= self.maxsize:
+            raise asyncio.QueueFull
+        self.queues.setdefault(key, deque()).append((item, model, time.monotonic()))
+        self.size += 1
+        self._not_empty.set()
+
+    async def get(self):
+        while not self.size:
+            self._not_empty.clear()
+            await self._not_empty.wait()
+
+        key = self._next_key()
+        queue = self.queues.pop(key)
+        item, model, enqueued = queue.popleft()
+        self.size -= 1
+
+        # Served keys go to the back of the line
+        if queue:
+            self.queues[key] = queue
+        return item
+
+    def _next_key(self):
+        first = next(iter(self.queues))
+        if self.is_resident is None:
+            return first
+
+        # Aging: the longest waiting request goes first once it has waited too long
+        oldest = min(self.queues, key=lambda key: self.queues[key][0][2])
+        if time.monotonic() - self.queues[oldest][0][2] >= self.max_wait:
+            return oldest
+
+        for key, queue in self.queues.items():
+            model = queue[0][1]
+            if model is None or self.is_resident(model):
+                return key
+        return first
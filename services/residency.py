@@ -0,0 +1,85 @@
+import asyncio
+
+from config.settings import RESIDENCY_POLL_INTERVAL
+
+
+def normalize_model_name(name):
+    """Name as the server reports it; an untagged name means the latest tag"""
+    return name if ":" in name else name + ":latest"
+
+
+class ResidentModel:
+    """A model the server currently holds in memory"""
+
+    __slots__ = ("name", "size", "size_vram")
+
+    def __init__(self, name, size=None, size_vram=None):
+        self.name = name
+        self.size = size  # Bytes, None until the server reports it
+        self.size_vram = size_vram
+
+    def __eq__(self, other):
+        return isinstance(other, ResidentModel) and (self.name, self.size, self.size_vram) == (
+            other.name, other.size, other.size_vram
+        )
+
+
+class ResidencyMonitor:
+    """View of the models loaded on the server, kept fresh by polling ps()
+
+    Runs on the transport's event loop. A model also counts as resident as
+    soon as a request for it starts, since the server loads it for that
+    request. listeners are called on the transport thread after every change.
+    """
+
+    def __init__(self, interval=RESIDENCY_POLL_INTERVAL):
+        self.interval = interval
+        self.models = {}  # Normalized name -> ResidentModel; replaced, never mutated
+        self.listeners = []
+
+    def is_resident(self, model):
+        return normalize_model_name(model) in self.models
+
+    def mark_loaded(self, model):
+        """Record that a request for a model started"""
+        if model and not self.is_resident(model):
+            models = dict(self.models)
+            models[normalize_model_name(model)] = ResidentModel(model)
+            self._set(models)
+
+    async def poll(self, client):
+        while True:
+            try:
+                response = await client.ps()
+            except Exception:
+                # Keep the last known view while the server is unreachable
+                pass
+            else:
+                self._set({
+                    normalize_model_name(entry.model): ResidentModel(entry.model, entry.size, entry.size_vram)
+                    for entry in response.models
+                })
+            await asyncio.sleep(self.interval)
+
+    def _set(self, models):
+        if models == self.models:
+            return
+        self.models = models
+        for listener in self.listeners:
+            listener()
+
+    def describe(self):
+        """Resident models and their memory use, for the status bar"""
+        models = list(self.models.values())
+        if not models:
+            return "Bellekte model yok"
+
+        parts = []
+        for model in models:
+            if model.size:
+                # Models that do not fit in VRAM run partly on the CPU
+                gpu = f", %{100 * model.size_vram // model.size} GPU" if model.size_vram is not None else ""
+                parts.append(f"{model.name} ({model.size / 1024 ** 3:.1f} GB{gpu})")
+            else:
+                parts.append(model.name)
+        return "Bellekte: " + ", ".join(parts)
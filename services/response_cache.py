@@ -0,0 +1,125 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+
+from config.settings import RESPONSE_CACHE_DIR, RESPONSE_CACHE_MAX_BYTES
+from services.events import ThinkingDelta, AnswerDelta, Done
+
+
+def cache_key(model, options, messages):
+    """Stable hash of everything that determines a response"""
+    payload = json.dumps(
+        [model, options or {}, [{"role": m["role"], "content": m["content"]} for m in messages]],
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """On-disk cache of final responses with size-based LRU eviction
+
+    Each entry is one JSON file holding the answer, the thinking text and the
+    timing stats. File mtimes double as last-use times, so the LRU order
+    survives restarts. Safe to use from several threads.
+    """
+
+    def __init__(self, directory=RESPONSE_CACHE_DIR, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # Key -> [size, last_used], loaded on first use
+        self._total = 0
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".json")
+
+    def _load_index(self):
+        if self._index is not None:
+            return
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._index = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                stat = entry.stat()
+                self._index[entry.name[:-5]] = [stat.st_size, stat.st_mtime]
+                self._total += stat.st_size
+
+    def get(self, key):
+        """Return the cached entry dict for key, or None"""
+        with self._lock:
+            self._load_index()
+            if key not in self._index:
+                return None
+            self._index[key][1] = time.time()
+
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(self._path(key))
+        except (OSError, ValueError):
+            return None
+        return entry
+
+    def put(self, key, answer, thinking, stats):
+        """Store a final response and evict least recently used entries over the size limit"""
+        data = json.dumps({"answer": answer, "thinking": thinking, "stats": stats}, ensure_ascii=False)
+        size = len(data.encode("utf-8"))
+
+        with self._lock:
+            self._load_index()
+
+            # Write to a temporary file first so readers never see half an entry
+            temp_path = self._path(key) + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(data)
+            os.replace(temp_path, self._path(key))
+
+            old = self._index.get(key)
+            self._total += size - (old[0] if old else 0)
+            self._index[key] = [size, time.time()]
+            self._evict()
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+
+        for key, (size, _) in sorted(self._index.items(), key=lambda item: item[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self._index[key]
+            self._total -= size
+
+    async def astream(self, key, events, to_thread):
+        """Replay a cached response, or pass events through and store the complete response
+
+        events is a callable returning the live async event stream; it is only
+        called on a cache miss. to_thread runs blocking disk access off the loop.
+        """
+        try:
+            entry = await to_thread(self.get, key)
+        except asyncio.CancelledError:
+            yield Done("", "", {}, truncated=True)
+            raise
+
+        if entry:
+            if entry["thinking"]:
+                yield ThinkingDelta(entry["thinking"])
+            if entry["answer"]:
+                yield AnswerDelta(entry["answer"])
+            yield Done(entry["answer"], entry["thinking"], entry["stats"], cached=True)
+            return
+
+        async for event in events():
+            yield event
+            if isinstance(event, Done) and not event.truncated:
+                # The reply was already delivered; a cancel now must not lose the write
+                await asyncio.shield(to_thread(self.put, key, event.answer, event.thinking, event.stats))
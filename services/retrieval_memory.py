@@ -0,0 +1,217 @@
+import hashlib
+import importlib.util
+import os
+import queue
+import threading
+
+from config.settings import RETRIEVAL_QUERY_TIMEOUT
+
+EMBED_BATCH = 32  # Turns embedded per request to the server
+EMBED_MAX_CHARS = 4000  # Longer turns are embedded by their beginning
+INITIAL_CAPACITY = 256  # Rows allocated before the matrix first grows
+
+
+def retrieval_available():
+    """Whether the optional NumPy package is installed (checked without importing it)"""
+    return importlib.util.find_spec("numpy") is not None
+
+
+def memory_path(journal_path):
+    """File next to a journal that holds the vectors of its turns"""
+    return os.path.splitext(journal_path)[0] + ".vectors.npz"
+
+
+def message_key(message):
+    """Key of a turn's text, used to match saved vectors to the turns of a reopened journal"""
+    return hashlib.sha1(f"{message.role}\0{message.content}".encode()).hexdigest()
+
+
+class VectorIndex:
+    """Unit vectors in one growing float32 matrix, searched by cosine similarity"""
+
+    def __init__(self):
+        import numpy as np
+        self.np = np
+        self.matrix = None
+        self.count = 0
+        self.keys = []
+        self.rows = {}  # Key -> row
+
+    @property
+    def dimensions(self):
+        return self.matrix.shape[1] if self.matrix is not None else None
+
+    @classmethod
+    def load(cls, path):
+        """Index saved at path, or an empty one"""
+        index = cls()
+        try:
+            with index.np.load(path) as data:
+                index.add(list(data["keys"]), data["vectors"])
+        except (OSError, KeyError, ValueError):
+            pass
+        return index
+
+    def snapshot(self):
+        """(vectors, keys) as of now; rows below count never change, so no copy is needed"""
+        return self.matrix[:self.count], self.keys[:self.count]
+
+    def save(self, path, vectors, keys):
+        """Write a snapshot atomically"""
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            self.np.savez(f, vectors=vectors, keys=self.np.array(keys))
+        os.replace(temp_path, path)
+
+    def add(self, keys, vectors):
+        np = self.np
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1, norms)
+
+        needed = self.count + len(vectors)
+        if self.matrix is None:
+            self.matrix = np.empty((max(INITIAL_CAPACITY, needed), vectors.shape[1]), dtype=np.float32)
+        elif needed > len(self.matrix):
+            # Doubling keeps appends amortized O(1) per row
+            grown = np.empty((max(needed, 2 * len(self.matrix)), self.matrix.shape[1]), dtype=np.float32)
+            grown[:self.count] = self.matrix[:self.count]
+            self.matrix = grown
+
+        self.matrix[self.count:needed] = vectors
+        for key in keys:
+            self.rows[key] = len(self.keys)
+            self.keys.append(key)
+        self.count = needed
+
+    def search(self, query, rows, k):
+        """Positions in rows of the k rows most similar to query, best first; rows of -1 are skipped"""
+        np = self.np
+        query = np.asarray(query, dtype=np.float32)
+        if k <= 0 or query.shape[0] != self.dimensions:
+            return []
+
+        rows = np.asarray(rows, dtype=np.int64)
+        positions = np.flatnonzero(rows >= 0)
+        if not len(positions):
+            return []
+
+        # One matrix-vector product over every row, then pick among the candidates
+        scores = (self.matrix[:self.count] @ query)[rows[positions]]
+        if k < len(scores):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        return [int(positions[i]) for i in top[np.argsort(-scores[top])]]
+
+
+class RetrievalMemory:
+    """Embeddings of a conversation's turns for recalling the ones relevant to a new message
+
+    Turns passed to remember() are embedded in batches on a background
+    thread through embed(texts, timeout), and the vectors are saved next to
+    the journal through the writer, so a reopened conversation does not
+    embed its turns again. NumPy is imported on that thread too.
+    """
+
+    def __init__(self, embed, path, writer=None):
+        self.embed = embed
+        self.path = path
+        self.writer = writer
+
+        self.index = None  # Loaded by the worker
+        self.lock = threading.Lock()
+        self.save_pending = False
+        self.remembered = {}  # id(message) -> message, for every turn passed to remember()
+        self.row_of = {}  # id(message) -> row of its vector
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._run, name="retrieval-memory", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        index = VectorIndex.load(self.path)
+        with self.lock:
+            self.index = index
+
+        while True:
+            batch = [self.jobs.get()]
+            while len(batch) < EMBED_BATCH and not self.jobs.empty():
+                batch.append(self.jobs.get())
+
+            closed = None in batch
+            self._embed_batch([job for job in batch if job is not None])
+            if closed:
+                break
+
+    def _embed_batch(self, batch):
+        keys = [message_key(message) for message in batch]
+
+        # Identical texts share one vector, and saved turns already have theirs
+        new = {}
+        for message, key in zip(batch, keys):
+            if key not in self.index.rows:
+                new[key] = message.content[:EMBED_MAX_CHARS]
+
+        if new:
+            try:
+                vectors = self.embed(list(new.values()))
+            except Exception:
+                # Leave these turns out of the memory rather than retrying them
+                return
+
+        with self.lock:
+            if new:
+                if self.index.dimensions not in (None, len(vectors[0])):
+                    # The embedding model changed; vectors of different models cannot be compared
+                    self.index = VectorIndex()
+                    self.row_of = {}
+                self.index.add(list(new), vectors)
+
+            for message, key in zip(batch, keys):
+                row = self.index.rows.get(key)
+                if row is not None:
+                    self.row_of[id(message)] = row
+
+        # One save covers every batch embedded before the writer gets to it
+        if new and self.writer and not self.save_pending:
+            self.save_pending = True
+            self.writer.submit(self._save)
+
+    def _save(self):
+        self.save_pending = False
+        with self.lock:
+            vectors, keys = self.index.snapshot()
+        self.index.save(self.path, vectors, keys)
+
+    def remember(self, messages):
+        """Queue turns added to the conversation for embedding"""
+        for message in messages:
+            if message.content and message.complete and id(message) not in self.remembered:
+                self.remembered[id(message)] = message
+                self.jobs.put(message)
+
+    def relevant(self, text, candidates, k):
+        """Indices into candidates of up to k turns most similar to text, best first
+
+        Waits at most RETRIEVAL_QUERY_TIMEOUT for the query embedding and
+        returns [] if it is not ready by then or the memory is still loading.
+        """
+        if self.index is None or not candidates:
+            return []
+
+        try:
+            query = self.embed([text[:EMBED_MAX_CHARS]], RETRIEVAL_QUERY_TIMEOUT)[0]
+        except Exception:
+            return []
+
+        with self.lock:
+            row_of = self.row_of
+            rows = [row_of.get(id(message), -1) for message in candidates]
+            return self.index.search(query, rows, k)
+
+    def close(self):
+        """Stop the worker once the queued turns are embedded"""
+        self.jobs.put(None)
@@ -0,0 +1,269 @@
+import json
+import math
+import os
+import pickle
+import re
+import threading
+from collections import Counter
+
+from config.settings import SEARCH_INDEX_PATH, SEARCH_DIRS
+from services.journal import iter_journal_records
+
+INDEX_VERSION = 2
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_RADIUS = 60
+COMPACT_RATIO = 0.25  # Share of removed doc ids above which update() renumbers the docs
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+def fold_case(text):
+    """Casefold text keeping one character per letter
+
+    casefold() turns the Turkish "İ" into "i" plus a combining dot, which
+    \\w does not match, so it is mapped to "i" first.
+    """
+    return text.replace("İ", "i").casefold()
+
+
+def tokenize(text):
+    """Lowercased word tokens; \\w is Unicode-aware, so Turkish letters are kept"""
+    return TOKEN_RE.findall(fold_case(text))
+
+
+def conversation_files(directories):
+    """Saved exports and journals found directly in the given directories"""
+    for directory in directories:
+        if not os.path.isdir(directory):
+            continue
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith((".json", ".jsonl")):
+                yield entry.path
+
+
+class SearchHit:
+    """One ranked turn of a saved conversation"""
+
+    __slots__ = ("path", "turn", "turns", "role", "score", "snippet")
+
+    def __init__(self, path, turn, turns, role, score, snippet):
+        self.path = path
+        self.turn = turn
+        self.turns = turns  # Turns of the conversation when it was indexed
+        self.role = role
+        self.score = score
+        self.snippet = snippet
+
+    def __repr__(self):
+        return f"SearchHit({os.path.basename(self.path)}#{self.turn}, score={self.score:.2f})"
+
+
+class SearchIndex:
+    """Inverted index over the turns of saved conversations, ranked with BM25
+
+    update() only reads files whose size or mtime changed since the last
+    run; journals that only grew are indexed from where the last run stopped.
+    The index is pickled next to the other app data between runs.
+    """
+
+    def __init__(self, path=SEARCH_INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+
+        self.files = {}  # Path -> [mtime_ns, size, indexed_offset, doc ids]
+        self.docs = []  # Doc id -> (path, turn, role, text, length), None once removed until compacted
+        self.postings = {}  # Term -> {doc id: term frequency}
+        self.total_length = 0
+        self.doc_count = 0
+        self.dirty = False
+
+    @classmethod
+    def load(cls, path=SEARCH_INDEX_PATH):
+        """Load the saved index, or start an empty one"""
+        index = cls(path)
+        try:
+            with open(path, "rb") as f:
+                version, state = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError):
+            return index
+
+        if version == INDEX_VERSION:
+            index.files, index.docs, index.postings, index.total_length, index.doc_count = state
+        return index
+
+    def save(self):
+        """Write the index if it changed"""
+        with self.lock:
+            if not self.dirty:
+                return
+            state = (self.files, self.docs, self.postings, self.total_length, self.doc_count)
+
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as f:
+                pickle.dump((INDEX_VERSION, state), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, self.path)
+            self.dirty = False
+
+    def update(self, directories=SEARCH_DIRS, paths=()):
+        """Bring the index up to date with the files on disk; returns the number of files read"""
+        seen = set(paths) | set(conversation_files(directories))
+        changed = 0
+
+        for path in seen:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+
+            state = self.files.get(path)
+            if state and state[0] == stat.st_mtime_ns and state[1] == stat.st_size:
+                continue
+
+            changed += 1
+            if state and path.endswith(".jsonl") and stat.st_size > state[2]:
+                # Journals are append-only: index just the new turns
+                self._index_journal(path, stat, state)
+            else:
+                self._remove_file(path)
+                self._index_file(path, stat)
+
+        # Forget files that were deleted or moved out of the searched directories
+        with self.lock:
+            gone = [path for path in self.files if path not in seen]
+        for path in gone:
+            self._remove_file(path)
+
+        with self.lock:
+            if len(self.docs) - self.doc_count > COMPACT_RATIO * len(self.docs):
+                self._compact()
+
+        return changed + len(gone)
+
+    def _index_file(self, path, stat):
+        state = [stat.st_mtime_ns, stat.st_size, 0, []]
+        if path.endswith(".jsonl"):
+            self._index_journal(path, stat, state)
+            return
+
+        try:
+            with open(path, encoding="utf-8") as f:
+                messages = json.load(f)
+        except (OSError, ValueError):
+            messages = None
+
+        with self.lock:
+            if isinstance(messages, list):
+                for turn, message in enumerate(messages):
+                    if isinstance(message, dict):
+                        self._add_doc(state, path, turn, message)
+            self.files[path] = state
+            self.dirty = True
+
+    def _index_journal(self, path, stat, state):
+        turn = len(state[3])
+        offset = state[2]
+        records = []
+        for offset, record in iter_journal_records(path, state[2]):
+            records.append(record)
+
+        with self.lock:
+            for record in records:
+                self._add_doc(state, path, turn, record)
+                turn += 1
+            state[0] = stat.st_mtime_ns
+            state[1] = stat.st_size
+            state[2] = offset
+            self.files[path] = state
+            self.dirty = True
+
+    def _add_doc(self, state, path, turn, message):
+        text = message.get("content") or ""
+        doc_id = len(self.docs)
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+
+        self.docs.append((path, turn, message.get("role", ""), text, length))
+        for term, frequency in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = frequency
+
+        state[3].append(doc_id)
+        self.total_length += length
+        self.doc_count += 1
+
+    def _remove_file(self, path):
+        with self.lock:
+            state = self.files.pop(path, None)
+            if not state:
+                return
+
+            for doc_id in state[3]:
+                _, _, _, text, length = self.docs[doc_id]
+                for term in set(tokenize(text)):
+                    postings = self.postings.get(term)
+                    if postings is not None:
+                        postings.pop(doc_id, None)
+                        if not postings:
+                            del self.postings[term]
+                self.docs[doc_id] = None
+                self.total_length -= length
+                self.doc_count -= 1
+            self.dirty = True
+
+    def _compact(self):
+        """Renumber the docs so removed ones stop taking space (lock held)"""
+        new_ids = {}
+        docs = []
+        for doc_id, doc in enumerate(self.docs):
+            if doc is not None:
+                new_ids[doc_id] = len(docs)
+                docs.append(doc)
+
+        self.docs = docs
+        self.postings = {
+            term: {new_ids[doc_id]: frequency for doc_id, frequency in postings.items()}
+            for term, postings in self.postings.items()
+        }
+        for state in self.files.values():
+            state[3] = [new_ids[doc_id] for doc_id in state[3]]
+        self.dirty = True
+
+    def search(self, query, limit=20):
+        """Return the best matching turns, highest score first"""
+        terms = set(tokenize(query))
+        with self.lock:
+            if not terms or not self.doc_count:
+                return []
+
+            average_length = self.total_length / self.doc_count
+            scores = Counter()
+            for term in terms:
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+
+                idf = math.log(1 + (self.doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, frequency in postings.items():
+                    length = self.docs[doc_id][4]
+                    norm = BM25_K1 * (1 - BM25_B + BM25_B * length / average_length)
+                    scores[doc_id] += idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+
+            hits = []
+            for doc_id, score in scores.most_common(limit):
+                path, turn, role, text, _ = self.docs[doc_id]
+                turns = len(self.files[path][3])
+                hits.append(SearchHit(path, turn, turns, role, score, make_snippet(text, terms)))
+            return hits
+
+
+def make_snippet(text, terms):
+    """Short single-line excerpt around the first query term in text"""
+    lowered = fold_case(text)
+    positions = [m.start() for m in TOKEN_RE.finditer(lowered) if m.group() in terms]
+    center = positions[0] if positions else 0
+
+    start = max(0, center - SNIPPET_RADIUS)
+    end = min(len(text), center + SNIPPET_RADIUS)
+    snippet = " ".join(text[start:end].split())
+    return ("…" if start > 0 else "") + snippet + ("…" if end < len(text) else "")
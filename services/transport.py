@@ -0,0 +1,175 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+
+from config.settings import OLLAMA_HOST, MAX_CONCURRENT_REQUESTS, REQUEST_QUEUE_SIZE
+from services.request_queue import FairRequestQueue
+from services.residency import ResidencyMonitor
+from services.events import Started, ThinkingDelta, AnswerDelta, Done, Error
+from services.response_cache import cache_key
+
+
+class TransportBusyError(RuntimeError):
+    """Raised when the request queue is full"""
+
+
+class OllamaTransport:
+    """One asyncio loop on a dedicated thread owning a pooled Ollama client
+
+    Jobs are coroutine functions taking the client. They wait in a bounded
+    queue that is served round-robin across keys (e.g. chat sessions), and
+    at most max_concurrent of them run at once, preferring requests for
+    models the server already has loaded (see residency). Every public
+    method is thread-safe and returns a concurrent.futures.Future.
+
+    The Ollama client library is imported on the transport thread, so
+    creating a transport returns at once and the UI can be drawn while it
+    loads; requests made before it is ready simply wait in the loop.
+    """
+
+    def __init__(self, host=OLLAMA_HOST, max_concurrent=MAX_CONCURRENT_REQUESTS, queue_size=REQUEST_QUEUE_SIZE):
+        self.host = host
+        self.max_concurrent = max_concurrent
+        self.queue_size = queue_size
+
+        # Models loaded on the server, polled once the client is ready
+        self.residency = ResidencyMonitor()
+        self.poll_task = None
+
+        self.loop = asyncio.new_event_loop()
+        self.ready = threading.Event()  # Set once the client library is loaded
+        self.client = None
+        self.startup_error = None
+        self.thread = threading.Thread(target=self._run, name="ollama-transport", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        self.queue = FairRequestQueue(self.queue_size, self.residency.is_resident)
+        self.running = {}  # Future -> task of the job serving it
+        self.workers = [self.loop.create_task(self._worker()) for _ in range(self.max_concurrent)]
+
+        try:
+            from ollama import AsyncClient
+
+            # The client's httpx pool keeps connections to the server open between requests
+            self.client = AsyncClient(host=self.host)
+            self.poll_task = self.loop.create_task(self.residency.poll(self.client))
+        except ImportError as e:
+            # Requests fail with this error instead of waiting forever
+            self.startup_error = e
+
+        self.ready.set()
+        self.loop.run_forever()
+
+    async def _run_job(self, job):
+        if self.client is None:
+            raise self.startup_error
+        return await job(self.client)
+
+    async def _worker(self):
+        while True:
+            job, future, model = await self.queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            self.residency.mark_loaded(model)
+
+            # Run the job as its own task so cancelling it leaves the worker alive
+            task = self.loop.create_task(self._run_job(job))
+            self.running[future] = task
+            await asyncio.wait([task])
+            del self.running[future]
+
+            if task.cancelled():
+                future.set_result(None)
+            elif task.exception() is not None:
+                future.set_exception(task.exception())
+            else:
+                future.set_result(task.result())
+
+    def submit(self, job, key=None, model=None):
+        """Queue job(client) behind other requests with the same key; model is the one it will load"""
+        future = Future()
+
+        def enqueue():
+            try:
+                self.queue.put_nowait(key, (job, future, model), model)
+            except asyncio.QueueFull:
+                future.set_exception(TransportBusyError("İstek kuyruğu dolu"))
+
+        self.loop.call_soon_threadsafe(enqueue)
+        return future
+
+    def call(self, job):
+        """Run job(client) right away, outside the request queue (for light requests)"""
+        return asyncio.run_coroutine_threadsafe(self._run_job(job), self.loop)
+
+    def stream_chat(self, model, messages, on_event, keep_alive=None, key=None, cache=None):
+        """Queue a streamed chat; on_event(event) is called on the transport thread
+
+        messages may also be a function returning them, called on a worker
+        thread once the request starts, for contexts that take a while to
+        build. With a ResponseCache, a cached reply is replayed through
+        on_event instead of contacting the server, and complete replies are
+        stored.
+        Every started request ends with a Done or Error event, including
+        requests cancelled before the stream could report it.
+        """
+        async def job(client):
+            answer_parts = []
+            thinking_parts = []
+            finished = False
+            try:
+                from services.ollama_service import astream_chat_events
+
+                payload = await asyncio.to_thread(messages) if callable(messages) else messages
+                on_event(Started())
+                source = lambda: astream_chat_events(model, payload, keep_alive, client)
+                if cache is None:
+                    events = source()
+                else:
+                    events = cache.astream(cache_key(model, None, payload), source, asyncio.to_thread)
+
+                async for event in events:
+                    if isinstance(event, AnswerDelta):
+                        answer_parts.append(event.text)
+                    elif isinstance(event, ThinkingDelta):
+                        thinking_parts.append(event.text)
+                    elif isinstance(event, (Done, Error)):
+                        finished = True
+                    on_event(event)
+            except asyncio.CancelledError:
+                if not finished:
+                    # Cancelled outside the model stream, e.g. while building the context or during a cache lookup
+                    on_event(Done("".join(answer_parts), "".join(thinking_parts), {}, truncated=True))
+                raise
+
+        return self.submit(job, key, model)
+
+    def cancel(self, future):
+        """Cancel a request; returns True if it was still queued and never started"""
+        if future.cancel():
+            return True
+
+        def cancel_task():
+            task = self.running.get(future)
+            if task:
+                task.cancel()
+
+        self.loop.call_soon_threadsafe(cancel_task)
+        return False
+
+    def close(self):
+        """Stop the loop and close pooled connections"""
+        async def shutdown():
+            for worker in self.workers:
+                worker.cancel()
+            if self.poll_task is not None:
+                self.poll_task.cancel()
+            if self.client is not None:
+                await self.client.close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(shutdown(), self.loop).result(timeout=2)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
@@ -0,0 +1,95 @@
+import pytest
+
+from utils.markdown_stream import FenceParser, parse_segments, TEXT, CODE_START, CODE, CODE_END
+
+MESSAGE = "Intro text\n```python\nprint(1)\nx = `y`\n```\nBetween\n```\nplain\n```\nOutro"
+
+
+def run(chunks):
+    """Feed chunks through a parser and return its events with adjacent text merged"""
+    parser = FenceParser()
+    events = []
+    for chunk in chunks:
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+
+    merged = []
+    for event, value in events:
+        if merged and event in (TEXT, CODE) and merged[-1][0] == event:
+            merged[-1] = (event, merged[-1][1] + value)
+        else:
+            merged.append((event, value))
+    return merged
+
+
+EXPECTED = [
+    (TEXT, "Intro text\n"),
+    (CODE_START, "python"),
+    (CODE, "print(1)\nx = `y`\n"),
+    (CODE_END, None),
+    (TEXT, "\nBetween\n"),
+    (CODE_START, ""),
+    (CODE, "plain\n"),
+    (CODE_END, None),
+    (TEXT, "\nOutro"),
+]
+
+
+def test_whole_message():
+    assert run([MESSAGE]) == EXPECTED
+
+
+@pytest.mark.parametrize("split", range(1, len(MESSAGE)))
+def test_split_at_every_boundary(split):
+    assert run([MESSAGE[:split], MESSAGE[split:]]) == EXPECTED
+
+
+def test_one_character_at_a_time():
+    assert run(list(MESSAGE)) == EXPECTED
+
+
+def test_unterminated_fence_is_closed():
+    assert run(["text\n```js\nlet a = 1;\n"]) == [
+        (TEXT, "text\n"),
+        (CODE_START, "js"),
+        (CODE, "let a = 1;\n"),
+        (CODE_END, None),
+    ]
+
+
+def test_unterminated_fence_keeps_trailing_backticks():
+    assert run(["```\ncode ``"]) == [(CODE_START, ""), (CODE, "code ``"), (CODE_END, None)]
+
+
+def test_unterminated_opening_line_is_kept_as_code():
+    assert run(["see ```foo"]) == [(TEXT, "see "), (CODE_START, ""), (CODE, "foo"), (CODE_END, None)]
+
+
+def test_language_is_first_word_of_info_string():
+    assert run(["```python title=app.py\npass\n```"]) == [
+        (CODE_START, "python"),
+        (CODE, "pass\n"),
+        (CODE_END, None),
+    ]
+
+
+def test_info_string_whitespace_is_ignored():
+    assert run(["```  rust  \nfn main() {}\n```"])[0] == (CODE_START, "rust")
+
+
+def test_fence_closed_on_its_opening_line():
+    assert run(["a ```inline``` b"]) == [
+        (TEXT, "a "),
+        (CODE_START, ""),
+        (CODE, "inline"),
+        (CODE_END, None),
+        (TEXT, " b"),
+    ]
+
+
+def test_parse_segments():
+    assert parse_segments("x\n```py\n1\n```\n") == [
+        ("text", "x\n", None),
+        ("code", "1\n", "py"),
+        ("text", "\n", None),
+    ]
@@ -0,0 +1,53 @@
+import json
+import os
+
+from services.search_index import SearchIndex, tokenize, make_snippet
+
+
+def write_export(path, contents):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump([{"role": "user", "content": content} for content in contents], f)
+
+
+def test_removed_files_are_compacted(tmp_path):
+    index = SearchIndex(str(tmp_path / "index.pickle"))
+    for name in "abcd":
+        write_export(str(tmp_path / f"{name}.json"), [f"elma {name}", f"armut {name}"])
+    index.update([str(tmp_path)])
+    assert len(index.docs) == 8
+
+    os.remove(tmp_path / "a.json")
+    os.remove(tmp_path / "b.json")
+    index.update([str(tmp_path)])
+
+    assert None not in index.docs
+    assert len(index.docs) == index.doc_count == 4
+    assert sorted(doc_id for state in index.files.values() for doc_id in state[3]) == [0, 1, 2, 3]
+    assert {os.path.basename(hit.path) for hit in index.search("elma")} == {"c.json", "d.json"}
+    assert [hit.snippet for hit in index.search("armut d")][0] == "armut d"
+
+
+def test_few_removed_docs_are_kept_until_compaction(tmp_path):
+    index = SearchIndex(str(tmp_path / "index.pickle"))
+    for name in "abcde":
+        write_export(str(tmp_path / f"{name}.json"), [f"elma {name}"])
+    index.update([str(tmp_path)])
+
+    os.remove(tmp_path / "a.json")
+    index.update([str(tmp_path)])
+
+    assert index.docs.count(None) == 1
+    assert len(index.search("elma")) == 4
+
+
+def test_dotted_capital_i_matches_lowercase(tmp_path):
+    assert tokenize("İstanbul'da İzmir") == ["istanbul", "da", "izmir"]
+
+    index = SearchIndex(str(tmp_path / "index.pickle"))
+    write_export(str(tmp_path / "a.json"), ["Dün İstanbul'a gittim"])
+    index.update([str(tmp_path)])
+
+    hits = index.search("istanbul")
+    assert len(hits) == 1
+    assert hits[0].snippet == "Dün İstanbul'a gittim"
+    assert make_snippet("x " * 100 + "İzmir", {"izmir"}).endswith("İzmir")
@@ -0,0 +1,67 @@
+import pytest
+
+from utils.think_splitter import ThinkTagSplitter, THINKING, ANSWER
+
+MESSAGE = "<think>\nLet me check a<b and c</d.\n</think>\n\nThe answer is <b>42</b>."
+
+
+def run(chunks):
+    """Feed chunks through a splitter and return its parts with adjacent parts of a kind merged"""
+    splitter = ThinkTagSplitter()
+    parts = []
+    for chunk in chunks:
+        parts.extend(splitter.feed(chunk))
+    parts.extend(splitter.close())
+
+    merged = []
+    for kind, text in parts:
+        if merged and merged[-1][0] == kind:
+            merged[-1] = (kind, merged[-1][1] + text)
+        else:
+            merged.append((kind, text))
+    return merged
+
+
+EXPECTED = [
+    (THINKING, "\nLet me check a<b and c</d.\n"),
+    (ANSWER, "\n\nThe answer is <b>42</b>."),
+]
+
+
+def test_whole_message():
+    assert run([MESSAGE]) == EXPECTED
+
+
+@pytest.mark.parametrize("split", range(1, len(MESSAGE)))
+def test_split_at_every_boundary(split):
+    assert run([MESSAGE[:split], MESSAGE[split:]]) == EXPECTED
+
+
+def test_one_character_at_a_time():
+    assert run(list(MESSAGE)) == EXPECTED
+
+
+def test_partial_prefix_that_is_not_a_tag():
+    splitter = ThinkTagSplitter()
+    assert splitter.feed("a <thi") == [(ANSWER, "a ")]
+    assert splitter.feed("ng>") == [(ANSWER, "<thing>")]
+    assert splitter.close() == []
+
+
+def test_partial_closing_prefix_that_is_not_a_tag():
+    assert run(["<think>x </thi", "s> y</think>z"]) == [(THINKING, "x </this> y"), (ANSWER, "z")]
+
+
+def test_stream_ending_inside_a_tag():
+    splitter = ThinkTagSplitter()
+    assert splitter.feed("answer <thin") == [(ANSWER, "answer ")]
+    assert splitter.close() == [(ANSWER, "<thin")]
+
+
+def test_stream_ending_inside_a_closing_tag():
+    assert run(["<think>still thinking</thi"]) == [(THINKING, "still thinking</thi")]
+
+
+def test_reply_without_think_block():
+    assert run(["Just ", "an answer."]) == [(ANSWER, "Just an answer.")]
+    assert run([]) == []
@@ -0,0 +1,341 @@
+import tkinter as tk
+from tkinter import ttk
+from collections import deque
+from itertools import chain
+from datetime import datetime
+
+from services.context_window import create_context_window
+from services.metrics import ResponseMetrics
+from services.conversation import Conversation, Message, USER
+from services.journal import (
+    SessionJournal, new_journal_path, open_history_reader, iter_conversation_records, iter_saved_records,
+)
+from ui.message_widgets import MessagesManager
+from ui.render_scheduler import RenderScheduler, StreamBridge
+
+
+class ChatSession:
+    """One chat tab with its own transcript, history, model and in-flight request
+
+    Shared resources (transport, theme, global settings) come from the app;
+    the session reports status changes back through app.on_session_status.
+    """
+
+    def __init__(self, app, parent, title, model, journal_path=None):
+        self.app = app
+        self.title = title
+        self.model_var = tk.StringVar(value=model)
+
+        self.frame = ttk.Frame(parent)
+
+        # Chat canvas
+        self.chat_canvas = tk.Canvas(
+            self.frame, bg=app.theme.bg_color, highlightthickness=0
+        )
+        self.chat_canvas.pack(side=tk.LEFT, fill="both", expand=True)
+
+        # Scrollbar
+        self.scrollbar = ttk.Scrollbar(
+            self.frame, orient="vertical", command=self.chat_canvas.yview
+        )
+        self.scrollbar.pack(side=tk.RIGHT, fill="y")
+        self.chat_canvas.configure(yscrollcommand=self.on_chat_scroll)
+        self.chat_canvas.bind("<Configure>", self.on_canvas_configure)
+
+        # Message manager
+        self.message_manager = MessagesManager(
+            self.chat_canvas,
+            app.theme,
+            self.model_var
+        )
+
+        # Streamed deltas reach the message manager at a bounded frame rate
+        self.render_scheduler = RenderScheduler(app.root)
+        self.render_scheduler.set_handler("thinking", self.message_manager.append_thinking)
+        self.render_scheduler.set_handler("answer", self.message_manager.append_ai_response)
+
+        # Conversation history; its Messages are also the transcript items showing them
+        self.conversation = Conversation()
+
+        # Every completed turn is appended to the session's journal on disk
+        self.journal = SessionJournal(journal_path or new_journal_path(), app.journal_writer)
+        self.history_reader = None  # Pages older turns in when a journal is opened
+        self.history_load_pending = False
+        self.history_callbacks = []  # Run once the page being read is shown
+        self.history_loaded = 0  # Turns of the opened file shown so far
+
+        # Embeddings of the turns for the retrieval context strategy, kept next to the journal
+        self.memory = app.create_memory(self.journal.path)
+
+        # Trims the history sent with each request to the token budget
+        self.context_window = self.create_context_window()
+        self.context_status = ""
+
+        # Request in flight and messages waiting for it
+        self.is_processing = False
+        self.current_request = None
+        self.current_bridge = None
+        self.current_metrics = None
+        self.request_id = 0
+        self.pending_messages = deque()
+
+        # Shown in the status bar while this session is the active tab
+        self.status_color = "#4CAF50"
+        self.status_text = "Hazır"
+
+    @property
+    def model(self):
+        return self.model_var.get()
+
+    def create_context_window(self):
+        return create_context_window(self.app.summarize_messages, memory=self.memory)
+
+    def on_canvas_configure(self, event):
+        # Resize messages according to canvas width
+        self.message_manager.transcript.set_width(event.width)
+        self.message_manager.transcript.schedule_refresh()
+
+    def on_chat_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        # Materialize the messages that scrolled into view
+        self.message_manager.transcript.schedule_refresh()
+
+        # Reaching the top of a loaded journal pages in the previous turns
+        if float(first) <= 0.0 and self.history_reader and not self.history_reader.exhausted:
+            self.load_older_history()
+
+    def open_history(self, path):
+        """Show the newest turns of a journal or saved export; older ones load on scroll"""
+        self.history_reader = open_history_reader(path)
+        self.history_loaded = 0
+        self.load_older_history(self.message_manager.scroll_to_bottom)
+
+    def show_turn(self, turn, turns):
+        """Scroll to a turn of the opened history, loading older pages only until it is shown
+
+        turns is the number of turns in the file; pages are read from its
+        end, so the turn is loaded once turns - turn of them are.
+        """
+        if self.history_reader and not self.history_reader.exhausted and self.history_loaded < turns - turn:
+            self.load_older_history(lambda: self.show_turn(turn, turns))
+            return
+
+        # The loaded turns are the last history_loaded of the file, at the top of the transcript
+        index = max(0, turn - (turns - self.history_loaded))
+        if index < len(self.message_manager.transcript.items):
+            self.message_manager.transcript.scroll_to(index)
+
+    def load_older_history(self, then=None):
+        """Read the next page of older turns on the writer thread; then() runs once it is shown"""
+        if then:
+            self.history_callbacks.append(then)
+        if self.history_load_pending:
+            return
+
+        self.history_load_pending = True
+        reader = self.history_reader
+        page = []
+        self.app.journal_writer.submit(
+            lambda: page.extend(reader.older_page()),
+            lambda error: self.app.root.after(0, self.show_older_history, reader, page, error),
+        )
+
+    def show_older_history(self, reader, records, error):
+        # Ignore pages of a history that was cleared or a tab that was closed meanwhile
+        if reader is not self.history_reader or not self.chat_canvas.winfo_exists():
+            return
+
+        self.history_load_pending = False
+        callbacks, self.history_callbacks = self.history_callbacks, []
+        if error:
+            self.history_reader = None
+            self.message_manager.add_system_message(f"Geçmiş yüklenemedi: {str(error)}")
+            return
+
+        messages = [Message.from_record(record) for record in records]
+        self.history_loaded += len(messages)
+        self.conversation.prepend(messages)
+        self.message_manager.prepend_history(messages)
+        if self.memory:
+            self.memory.remember(messages)
+
+        # The summary strategy tracks history by position, which just shifted
+        self.context_window = self.create_context_window()
+
+        for callback in callbacks:
+            callback()
+
+    def export_source(self):
+        """(records factory, count or None) covering every turn of the session, for exporting
+
+        Journal pages that were never scrolled in are streamed from the file;
+        the records are read on the writer thread after pending journal writes.
+        """
+        reader = self.history_reader
+        if reader and not reader.exhausted:
+            if reader.path == self.journal.path:
+                path = self.journal.path
+                return lambda: iter_conversation_records(path), None
+
+            # A saved export: the whole file, then the turns added since it was opened
+            path = reader.path
+            added = self.conversation.snapshot()[self.history_loaded:]
+            return lambda: chain(iter_saved_records(path), (message.to_record() for message in added)), None
+
+        snapshot = self.conversation.snapshot()
+        return lambda: (message.to_record() for message in snapshot), len(snapshot)
+
+    def set_status(self, color, text):
+        self.status_color = color
+        self.status_text = text
+        self.app.on_session_status(self)
+
+    def send(self, user_message):
+        # Messages typed while a reply is streaming are sent after it, in order
+        if self.is_processing:
+            self.pending_messages.append(user_message)
+            self.update_processing_status()
+            return
+
+        self.process_message(user_message)
+
+    def process_message(self, user_message):
+        # Add to chat history and show it
+        message = self.conversation.add(USER, user_message, timestamp=datetime.now())
+        self.message_manager.add_message(message)
+        self.journal.append(message.to_record())
+        if self.memory:
+            self.memory.remember([message])
+
+        # Reset for new response
+        self.message_manager.reset_response_widgets()
+
+        # Switch session to processing mode
+        self.is_processing = True
+        self.update_processing_status()
+
+        # Only send what fits in the token budget. The context is built on a worker thread when the
+        # request starts, since recalling past turns waits for the message's embedding
+        snapshot = self.conversation.snapshot()
+        context_window = self.context_window
+
+        def build_context():
+            context = context_window.build(snapshot)
+            self.app.root.after(0, self.set_context_status, context)
+            return context.messages
+
+        # Stream the reply on the shared transport; events come back through the render scheduler
+        self.request_id += 1
+        request_id = self.request_id
+        self.current_metrics = ResponseMetrics(self.model)
+        self.current_bridge = bridge = StreamBridge(
+            self.render_scheduler,
+            self.app.show_thinking_var.get(),
+            lambda done: self.on_response_finished(request_id, done),
+            lambda error: self.on_response_error(request_id, error),
+            self.current_metrics,
+        )
+        self.current_request = self.app.transport.stream_chat(
+            self.model, build_context, bridge, self.app.keep_alive(self.model), key=self,
+            cache=self.app.response_cache_for(self.model),
+        )
+        bridge.watch(self.current_request)
+
+    def set_context_status(self, context):
+        self.context_status = f"{context.sent_tokens} token gönderildi, {context.dropped_tokens} atlandı"
+
+    def update_processing_status(self):
+        queued = f" ({len(self.pending_messages)} mesaj sırada)" if self.pending_messages else ""
+        self.set_status("#FFA500", "İşleniyor..." + queued)  # Orange = Processing
+
+    def stop_generation(self):
+        """Cancel the streaming reply; the partial answer is kept"""
+        if not self.is_processing:
+            return
+
+        if self.app.transport.cancel(self.current_request):
+            # Never reached the server, so no Done event will follow
+            self.on_processing_finished()
+
+    def on_response_finished(self, request_id, done):
+        # Ignore replies of requests that were cleared in the meantime
+        if request_id != self.request_id:
+            return
+
+        # Add the streamed AI message to chat history, marking replies cut short by the user
+        if done.answer:
+            message = self.message_manager.current_ai_item()
+            message.content = done.answer
+            message.thinking = done.thinking
+            message.truncated = done.truncated
+            self.conversation.append(message)
+            self.journal.append(message.to_record())
+            if self.memory:
+                self.memory.remember([message])
+
+        self.app.metrics.record(self.current_metrics)
+        self.message_manager.finish_ai_response(
+            "önbellekten" if done.cached else self.current_metrics.header_text()
+        )
+        if done.truncated:
+            self.message_manager.add_system_message("Yanıt durduruldu.")
+        self.on_processing_finished()
+
+    def on_response_error(self, request_id, error):
+        if request_id != self.request_id:
+            return
+
+        self.message_manager.finish_ai_response()
+        self.message_manager.add_system_message(f"Hata: {str(error)}")
+        self.on_processing_finished()
+
+    def on_processing_finished(self):
+        self.is_processing = False
+        self.current_request = None
+
+        # Send the next queued message, if any
+        if self.pending_messages:
+            self.process_message(self.pending_messages.popleft())
+            return
+
+        self.set_status("#4CAF50", f"Hazır · {self.context_status}" if self.context_status else "Hazır")
+
+    def cancel_all(self):
+        """Drop the streaming reply and everything queued behind it"""
+        if self.is_processing:
+            self.current_bridge.detach()
+            self.app.transport.cancel(self.current_request)
+            self.render_scheduler.discard()
+        self.pending_messages.clear()
+        self.request_id += 1
+
+    def clear(self):
+        self.cancel_all()
+
+        # The cleared turns stay in the old journal; new ones go to a fresh file
+        self.journal = SessionJournal(new_journal_path(), self.app.journal_writer)
+        self.history_reader = None
+        self.history_load_pending = False
+        self.history_callbacks = []
+        if self.memory:
+            self.memory.close()
+        self.memory = self.app.create_memory(self.journal.path)
+
+        self.conversation = Conversation()
+        self.context_window = self.create_context_window()
+        self.context_status = ""
+
+        self.on_processing_finished()
+        self.message_manager.clear()
+        self.message_manager.add_system_message("Sohbet temizlendi. Seçili model: " + self.model)
+
+    def close(self):
+        """Cancel requests and stop background work before the tab is destroyed"""
+        self.cancel_all()
+        self.message_manager.close()
+        if self.memory:
+            self.memory.close()
+
+    def apply_theme(self):
+        self.chat_canvas.config(bg=self.app.theme.bg_color)
+        self.message_manager.apply_theme()
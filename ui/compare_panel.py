@@ -0,0 +1,253 @@
+import tkinter as tk
+from tkinter import ttk
+from collections import deque
+
+from config.settings import COMPARE_MAX_MODELS
+from services.conversation import USER
+from services.metrics import ResponseMetrics
+from ui.render_scheduler import RenderScheduler, StreamBridge
+
+
+class CompareColumn:
+    """One model's reply to the compared prompt, streamed into its own Text"""
+
+    def __init__(self, panel, parent, model):
+        self.panel = panel
+        self.model = model
+        self.request = None
+        self.bridge = None
+        self.metrics = None
+        self.running = False
+
+        theme = panel.app.theme
+        self.frame = ttk.Frame(parent)
+
+        ttk.Label(self.frame, text=model, style="TLabel", font=("Segoe UI", 9, "bold")).pack(anchor="w")
+        self.info_label = ttk.Label(self.frame, text="Sırada", style="TLabel", font=("Segoe UI", 8))
+        self.info_label.pack(anchor="w", pady=(0, 5))
+
+        self.text = tk.Text(
+            self.frame,
+            wrap=tk.WORD,
+            width=40,
+            bg=theme.ai_msg_bg,
+            fg=theme.ai_msg_fg,
+            font=("Segoe UI", 10),
+            padx=10,
+            pady=10,
+            relief="flat",
+            state="disabled",
+        )
+        self.text.tag_configure("thinking", foreground=theme.think_fg, font=("Segoe UI", 10, "italic"))
+        self.text.pack(fill="both", expand=True)
+
+        # Deltas reach the Text at a bounded frame rate, like a chat tab
+        self.render_scheduler = RenderScheduler(panel.app.root)
+        self.render_scheduler.set_handler("thinking", lambda delta: self.insert(delta, "thinking"))
+        self.render_scheduler.set_handler("answer", lambda delta: self.insert(delta))
+
+    def insert(self, delta, tag=None):
+        if not self.text.winfo_exists():
+            return
+        self.text.config(state="normal")
+        self.text.insert("end", delta, tag)
+        self.text.config(state="disabled")
+        self.text.see("end")
+
+    def start(self, messages, keep_alive):
+        app = self.panel.app
+        self.running = True
+        self.info_label.config(text="Yanıt bekleniyor...")
+
+        self.metrics = ResponseMetrics(self.model)
+        self.bridge = StreamBridge(
+            self.render_scheduler,
+            app.show_thinking_var.get(),
+            self.on_done,
+            self.on_error,
+            self.metrics,
+        )
+        self.request = app.transport.stream_chat(
+            self.model, messages, self.bridge, keep_alive, key=self,
+            cache=app.response_cache_for(self.model),
+        )
+        self.bridge.watch(self.request)
+
+    def on_done(self, done):
+        self.running = False
+        self.panel.app.metrics.record(self.metrics)
+
+        parts = ["önbellekten" if done.cached else self.metrics.header_text()]
+        if self.metrics.wall_time is not None:
+            parts.append(f"toplam {self.metrics.wall_time:.2f} sn")
+        if done.truncated:
+            parts.append("durduruldu")
+        self.info_label.config(text=" · ".join(part for part in parts if part))
+        self.panel.on_column_finished(self)
+
+    def on_error(self, error):
+        self.running = False
+        self.info_label.config(text=f"Hata: {str(error)}")
+        self.panel.on_column_finished(self)
+
+    def cancel(self):
+        """Stop the request; the streamed part is kept"""
+        if self.running:
+            self.bridge.detach()
+            self.panel.app.transport.cancel(self.request)
+            self.render_scheduler.discard()
+            self.running = False
+            self.info_label.config(text="Durduruldu")
+
+
+class ComparePanel:
+    """Window that sends one prompt to several models and shows the replies side by side
+
+    At most max_models requests stream at once; the other models wait their
+    turn so the server never has to hold more of them in memory than that.
+    """
+
+    def __init__(self, app, max_models=COMPARE_MAX_MODELS):
+        self.app = app
+        self.max_models = max(1, max_models)
+        self.columns = []
+        self.waiting = deque()
+        self.messages = []
+        self.in_turns = False
+
+        theme = app.theme
+        self.window = tk.Toplevel(app.root, bg=theme.bg_color)
+        self.window.title("Model Karşılaştırma")
+        self.window.geometry("1100x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        # Models to compare, the selected one checked by default
+        models_frame = ttk.Frame(frame)
+        models_frame.pack(fill="x")
+        self.model_vars = {}
+        for model in app.model_combo["values"]:
+            var = tk.BooleanVar(value=model == app.model_var.get())
+            ttk.Checkbutton(models_frame, text=model, variable=var, style="TCheckbutton").pack(side=tk.LEFT, padx=(0, 10))
+            self.model_vars[model] = var
+
+        # Prompt and buttons
+        input_frame = ttk.Frame(frame)
+        input_frame.pack(fill="x", pady=10)
+
+        self.prompt_box = tk.Text(
+            input_frame,
+            height=3,
+            wrap=tk.WORD,
+            bg=theme.ai_msg_bg,
+            fg=theme.text_color,
+            insertbackground=theme.text_color,
+            font=("Segoe UI", 10),
+            padx=10,
+            pady=10,
+            relief="flat",
+        )
+        self.prompt_box.pack(side=tk.LEFT, fill="both", expand=True, padx=(0, 10))
+        self.prompt_box.focus_set()
+
+        tk.Button(
+            input_frame,
+            text="Karşılaştır",
+            bg=theme.button_bg,
+            fg=theme.button_fg,
+            relief="flat",
+            font=("Segoe UI", 10, "bold"),
+            padx=15,
+            command=self.compare,
+        ).pack(side=tk.RIGHT)
+
+        tk.Button(
+            input_frame,
+            text="Durdur",
+            bg=theme.user_msg_bg,
+            fg=theme.user_msg_fg,
+            relief="flat",
+            font=("Segoe UI", 10, "bold"),
+            padx=15,
+            command=self.stop,
+        ).pack(side=tk.RIGHT, padx=(0, 5))
+
+        self.columns_frame = ttk.Frame(frame)
+        self.columns_frame.pack(fill="both", expand=True)
+
+        self.status_label = ttk.Label(frame, text="", style="TLabel")
+        self.status_label.pack(anchor="w", pady=(5, 0))
+
+    def compare(self):
+        prompt = self.prompt_box.get("1.0", "end-1c").strip()
+        models = [model for model, var in self.model_vars.items() if var.get()]
+        if not prompt or not models:
+            return
+
+        self.stop()
+        for index, column in enumerate(self.columns):
+            column.frame.destroy()
+            # A smaller comparison must not leave empty columns taking up width
+            self.columns_frame.columnconfigure(index, weight=0, uniform="")
+
+        self.messages = [{"role": USER, "content": prompt}]
+        self.columns = []
+        for index, model in enumerate(models):
+            column = CompareColumn(self, self.columns_frame, model)
+            column.frame.grid(row=0, column=index, sticky="nsew", padx=(0, 10))
+            self.columns_frame.columnconfigure(index, weight=1, uniform="compare")
+            self.columns.append(column)
+        self.columns_frame.rowconfigure(0, weight=1)
+
+        self.in_turns = len(models) > self.max_models
+
+        self.waiting = deque(self.columns)
+        for _ in range(self.max_models):
+            self.start_next()
+        self.update_status()
+
+    def start_next(self):
+        if self.waiting:
+            column = self.waiting.popleft()
+            column.start(self.messages, self.keep_alive_for(column.model))
+
+    def keep_alive_for(self, model):
+        # Models that run in turns are unloaded right after their reply to make room for the next,
+        # except the pinned one
+        if self.in_turns and model != self.app.pinned_model:
+            return 0
+        return self.app.keep_alive(model)
+
+    def on_column_finished(self, column):
+        if not self.window.winfo_exists():
+            return
+        self.start_next()
+        self.update_status()
+
+    def update_status(self):
+        running = sum(column.running for column in self.columns)
+        if running or self.waiting:
+            self.status_label.config(text=f"{running} model yanıtlıyor, {len(self.waiting)} model sırada")
+        else:
+            self.status_label.config(text="Tamamlandı")
+
+    def stop(self):
+        """Cancel running replies and drop the models still waiting"""
+        for column in self.waiting:
+            column.info_label.config(text="İptal edildi")
+        self.waiting.clear()
+        for column in self.columns:
+            column.cancel()
+        if self.columns:
+            self.update_status()
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        self.stop()
+        self.window.destroy()
+        self.app.compare_panel = None
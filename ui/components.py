@@ -1,6 +1,15 @@
 import tkinter as tk
 from tkinter import ttk
 
+# Shown until the installed models are known
+DEFAULT_MODELS = (
+    "deepseek-r1:14b",
+    "llama3:8b",
+    "gemma:7b",
+    "mistral:7b",
+    "codellama:7b"
+)
+
 
 def create_top_frame(main_frame, theme):
     """Create the top frame with model selection and settings"""
@@ -10,25 +19,39 @@ def create_top_frame(main_frame, theme):
     # Model selection
     ttk.Label(top_frame, text="Model:", style="TLabel").pack(side=tk.LEFT, padx=(0, 5))
 
-    model_var = tk.StringVar(value="deepseek-r1:14b")
+    # Filled with the installed models once the model catalog is loaded
+    model_var = tk.StringVar(value=DEFAULT_MODELS[0])
     model_combo = ttk.Combobox(top_frame, textvariable=model_var, state="readonly", width=15)
-    model_combo["values"] = (
-        "deepseek-r1:14b",
-        "llama3:8b",
-        "gemma:7b",
-        "mistral:7b",
-        "codellama:7b"
-    )
+    model_combo["values"] = DEFAULT_MODELS
     model_combo.pack(side=tk.LEFT, padx=(0, 15))
 
-    # Thinking mode option
+    # Thinking mode option, only enabled for reasoning models
     show_thinking_var = tk.BooleanVar(value=True)
-    ttk.Checkbutton(
+    show_thinking_check = ttk.Checkbutton(
         top_frame,
         text="Düşünme sürecini göster",
         variable=show_thinking_var,
         style="TCheckbutton"
-    ).pack(side=tk.LEFT)
+    )
+    show_thinking_check.pack(side=tk.LEFT)
+
+    # Keep the selected model loaded on the server
+    pin_model_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        top_frame,
+        text="Modeli bellekte tut",
+        variable=pin_model_var,
+        style="TCheckbutton"
+    ).pack(side=tk.LEFT, padx=(15, 0))
+
+    # Skip the response cache for the selected model
+    bypass_cache_var = tk.BooleanVar(value=False)
+    ttk.Checkbutton(
+        top_frame,
+        text="Önbelleği atla",
+        variable=bypass_cache_var,
+        style="TCheckbutton"
+    ).pack(side=tk.LEFT, padx=(15, 0))
 
     # Status indicator
     status_frame = ttk.Frame(top_frame)
@@ -43,14 +66,58 @@ def create_top_frame(main_frame, theme):
     status_label = ttk.Label(status_frame, text="Hazır", style="TLabel")
     status_label.pack(side=tk.RIGHT)
 
-    return top_frame, model_var, show_thinking_var, status_dot, status_label
+    # Models loaded on the server and their memory use
+    resident_label = ttk.Label(status_frame, text="", style="TLabel", font=("Segoe UI", 8))
+    resident_label.pack(side=tk.LEFT, padx=(0, 15), before=status_dot)
 
+    return (
+        top_frame,
+        model_var,
+        model_combo,
+        show_thinking_var,
+        show_thinking_check,
+        pin_model_var,
+        bypass_cache_var,
+        status_dot,
+        status_label,
+        resident_label,
+    )
 
-def create_toolbar(main_frame, theme, clear_func, save_func, theme_func):
+
+def create_toolbar(
+    main_frame, theme, clear_func, save_func, theme_func, new_tab_func, close_tab_func, load_func, search_func,
+    stats_func, compare_func,
+):
     """Create the bottom toolbar with extra buttons"""
     toolbar_frame = ttk.Frame(main_frame)
     toolbar_frame.pack(fill="x", pady=(10, 0))
 
+    # New chat tab button
+    new_tab_button = tk.Button(
+        toolbar_frame,
+        text="Yeni Sekme",
+        bg=theme.user_msg_bg,
+        fg=theme.user_msg_fg,
+        relief="flat",
+        font=("Segoe UI", 9),
+        padx=10,
+        command=new_tab_func,
+    )
+    new_tab_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Close chat tab button
+    close_tab_button = tk.Button(
+        toolbar_frame,
+        text="Sekmeyi Kapat",
+        bg=theme.user_msg_bg,
+        fg=theme.user_msg_fg,
+        relief="flat",
+        font=("Segoe UI", 9),
+        padx=10,
+        command=close_tab_func,
+    )
+    close_tab_button.pack(side=tk.LEFT, padx=(0, 5))
+
     # Clear button
     clear_button = tk.Button(
         toolbar_frame,
@@ -77,6 +144,58 @@ def create_toolbar(main_frame, theme, clear_func, save_func, theme_func):
     )
     save_button.pack(side=tk.LEFT, padx=(0, 5))
 
+    # Load conversation button
+    load_button = tk.Button(
+        toolbar_frame,
+        text="Yükle",
+        bg=theme.user_msg_bg,
+        fg=theme.user_msg_fg,
+        relief="flat",
+        font=("Segoe UI", 9),
+        padx=10,
+        command=load_func,
+    )
+    load_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Search saved conversations button
+    search_button = tk.Button(
+        toolbar_frame,
+        text="Ara",
+        bg=theme.user_msg_bg,
+        fg=theme.user_msg_fg,
+        relief="flat",
+        font=("Segoe UI", 9),
+        padx=10,
+        command=search_func,
+    )
+    search_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Generation metrics button
+    stats_button = tk.Button(
+        toolbar_frame,
+        text="İstatistik",
+        bg=theme.user_msg_bg,
+        fg=theme.user_msg_fg,
+        relief="flat",
+        font=("Segoe UI", 9),
+        padx=10,
+        command=stats_func,
+    )
+    stats_button.pack(side=tk.LEFT, padx=(0, 5))
+
+    # Multi-model comparison button
+    compare_button = tk.Button(
+        toolbar_frame,
+        text="Karşılaştır",
+        bg=theme.user_msg_bg,
+        fg=theme.user_msg_fg,
+        relief="flat",
+        font=("Segoe UI", 9),
+        padx=10,
+        command=compare_func,
+    )
+    compare_button.pack(side=tk.LEFT, padx=(0, 5))
+
     # Change theme button
     theme_button = tk.Button(
         toolbar_frame,
@@ -91,7 +210,10 @@ def create_toolbar(main_frame, theme, clear_func, save_func, theme_func):
     theme_button.pack(side=tk.LEFT)
 
     # Hover effects for toolbar buttons
-    buttons = [clear_button, save_button, theme_button]
+    buttons = [
+        new_tab_button, close_tab_button, clear_button, save_button, load_button, search_button, stats_button,
+        compare_button, theme_button,
+    ]
     for btn in buttons:
         btn.bind("<Enter>", lambda e, b=btn: b.config(bg="#545474"))
         btn.bind("<Leave>", lambda e, b=btn: b.config(bg=theme.user_msg_bg))
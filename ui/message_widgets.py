@@ -1,233 +1,411 @@
 import tkinter as tk
 from tkinter import ttk
-import re
 from datetime import datetime
 
-
-class MessagesManager:
-    def __init__(self, messages_frame, chat_canvas, theme, model_var):
-        self.messages_frame = messages_frame
-        self.chat_canvas = chat_canvas
+from services.conversation import Message, SYSTEM, ASSISTANT
+from ui.syntax_highlight import SyntaxHighlighter
+from ui.transcript import VirtualTranscript
+from utils.helpers import format_timestamp
+from utils.markdown_stream import FenceParser, TEXT, CODE_START, CODE, CODE_END
+
+# Theme attributes (background, foreground) used by each widget role
+STYLE_ROLES = {
+    "system": ("ai_msg_bg", "think_fg"),
+    "timestamp": ("bg_color", "think_fg"),
+    "header": ("bg_color", "accent_color"),
+    "user_bubble": ("user_msg_bg", "user_msg_fg"),
+    "ai_bubble": ("ai_msg_bg", "ai_msg_fg"),
+    "thinking": ("think_bg", "think_fg"),
+    "code_frame": ("code_bg", None),
+    "code": ("code_bg", "code_fg"),
+}
+
+
+def create_text_view(parent, font):
+    """Read-only Text that grows with its content, so streamed text can be appended in place"""
+    text = tk.Text(
+        parent,
+        wrap=tk.WORD,
+        width=75,
+        height=1,
+        font=font,
+        padx=15,
+        pady=10,
+        relief="flat",
+        borderwidth=0,
+        highlightthickness=0,
+        state="disabled",
+    )
+    # The wrapped line count depends on the width, which is only known once the widget is laid out
+    text.bind("<Configure>", lambda e: fit_height(text), add="+")
+    return text
+
+
+def append_text_view(text, delta):
+    text.config(state="normal")
+    text.insert("end", delta)
+    text.config(state="disabled")
+    fit_height(text)
+
+
+def fit_height(text):
+    """Resize a text view to show all of its wrapped lines"""
+    # "update" only lays out lines changed since the last count, so appending stays cheap
+    lines = text.count("1.0", "end", "update", "displaylines")
+    if isinstance(lines, tuple):
+        lines = lines[0]
+    lines = max(1, lines or 0)
+    if int(text.cget("height")) != lines:
+        text.config(height=lines)
+
+
+class StyleRegistry:
+    """Track live message widgets by role so a theme change can recolor them in place"""
+
+    def __init__(self, theme):
         self.theme = theme
-        self.model_var = model_var
-
-        # Current active response widgets
-        self.current_ai_message_frame = None
-        self.current_thinking_frame = None
-        self.is_thinking_active = False
-
-    def add_system_message(self, message):
-        """Add a gray system message"""
-        frame = ttk.Frame(self.messages_frame, style="TFrame")
-        frame.pack(fill="x", padx=10, pady=5)
-
-        msg_label = tk.Label(
-            frame,
-            text=message,
+        self.widgets = {role: set() for role in STYLE_ROLES}
+
+    def register(self, widget, role):
+        """Color a widget for its role and remember it until it is destroyed"""
+        widget.config(**self.options(role))
+        self.widgets[role].add(widget)
+        widget.bind("<Destroy>", lambda e, w=widget, r=role: self.widgets[r].discard(w), add="+")
+        return widget
+
+    def options(self, role):
+        bg, fg = STYLE_ROLES[role]
+        options = {"bg": getattr(self.theme, bg)}
+        if fg:
+            options["fg"] = getattr(self.theme, fg)
+        return options
+
+    def apply(self):
+        """Recolor every registered widget with the current theme"""
+        for role, widgets in self.widgets.items():
+            options = self.options(role)
+            for widget in widgets:
+                widget.config(**options)
+
+
+class SystemMessageView:
+    """Widgets for a gray system message"""
+
+    def __init__(self, parent, styles):
+        self.frame = ttk.Frame(parent, style="TFrame")
+
+        self.msg_label = styles.register(tk.Label(
+            self.frame,
             wraplength=800,
             justify="center",
-            bg=self.theme.ai_msg_bg,
-            fg=self.theme.think_fg,
             padx=10,
             pady=5,
             font=("Segoe UI", 9, "italic"),
-        )
-        msg_label.pack(fill="x")
+        ), "system")
+        self.msg_label.pack(fill="x")
 
-        self.scroll_to_bottom()
+    def bind(self, item):
+        self.msg_label.config(text=item.content)
+
+
+class UserMessageView:
+    """Widgets for a blue user message"""
 
-    def add_user_message(self, message):
-        """Add a blue user message"""
-        frame = ttk.Frame(self.messages_frame, style="TFrame")
-        frame.pack(fill="x", padx=10, pady=5)
+    def __init__(self, parent, styles):
+        self.frame = ttk.Frame(parent, style="TFrame")
 
         # Right aligned
-        msg_frame = ttk.Frame(frame, style="TFrame")
+        msg_frame = ttk.Frame(self.frame, style="TFrame")
         msg_frame.pack(side=tk.RIGHT)
 
-        timestamp = datetime.now().strftime("%H:%M")
-        time_label = tk.Label(
+        self.time_label = styles.register(tk.Label(
             msg_frame,
-            text=timestamp,
-            bg=self.theme.bg_color,
-            fg=self.theme.think_fg,
             font=("Segoe UI", 8),
-        )
-        time_label.pack(anchor="e", padx=(0, 5), pady=(0, 2))
+        ), "timestamp")
+        self.time_label.pack(anchor="e", padx=(0, 5), pady=(0, 2))
 
-        msg_label = tk.Label(
+        self.msg_label = styles.register(tk.Label(
             msg_frame,
-            text=message,
             wraplength=600,
             justify="left",
-            bg=self.theme.user_msg_bg,
-            fg=self.theme.user_msg_fg,
             padx=15,
             pady=10,
             font=("Segoe UI", 10),
-        )
-        msg_label.pack(anchor="e")
+        ), "user_bubble")
+        self.msg_label.pack(anchor="e")
 
-        self.scroll_to_bottom()
+    def bind(self, item):
+        self.time_label.config(text=format_timestamp(item.timestamp))
+        self.msg_label.config(text=item.content)
+
+
+class AIMessageView:
+    """Widgets for an AI message: header, thinking text and answer segments"""
 
-    def add_new_ai_message_frame(self):
-        """Create a new AI message frame"""
-        frame = ttk.Frame(self.messages_frame, style="TFrame")
-        frame.pack(fill="x", padx=10, pady=5)
+    def __init__(self, parent, styles, highlighter):
+        self.styles = styles
+        self.highlighter = highlighter
+        self.frame = ttk.Frame(parent, style="TFrame")
 
         # Left aligned
-        msg_frame = ttk.Frame(frame, style="TFrame")
-        msg_frame.pack(side=tk.LEFT)
+        self.msg_frame = ttk.Frame(self.frame, style="TFrame")
+        self.msg_frame.pack(side=tk.LEFT)
 
         # Model and time info
-        header_frame = ttk.Frame(msg_frame, style="TFrame")
+        header_frame = ttk.Frame(self.msg_frame, style="TFrame")
         header_frame.pack(anchor="w", fill="x", pady=(0, 2))
 
-        model_label = tk.Label(
+        self.model_label = styles.register(tk.Label(
             header_frame,
-            text=self.model_var.get(),
-            bg=self.theme.bg_color,
-            fg=self.theme.accent_color,
             font=("Segoe UI", 8, "bold"),
-        )
-        model_label.pack(side=tk.LEFT, padx=(5, 10))
+        ), "header")
+        self.model_label.pack(side=tk.LEFT, padx=(5, 10))
 
-        timestamp = datetime.now().strftime("%H:%M")
-        time_label = tk.Label(
+        self.time_label = styles.register(tk.Label(
             header_frame,
-            text=timestamp,
-            bg=self.theme.bg_color,
-            fg=self.theme.think_fg,
             font=("Segoe UI", 8),
-        )
-        time_label.pack(side=tk.LEFT)
+        ), "timestamp")
+        self.time_label.pack(side=tk.LEFT)
+
+        self.info_label = styles.register(tk.Label(
+            header_frame,
+            font=("Segoe UI", 8, "italic"),
+        ), "timestamp")
+        self.info_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        # Custom style for thinking mode
+        self.think_text = styles.register(create_text_view(self.msg_frame, ("Segoe UI", 10, "italic")), "thinking")
+
+        self.segments = []
+        self.fence_parser = FenceParser()
+        self.segment_widget = None
+        self.segment_text = ""  # Text held back until it is more than whitespace
+        self.code_blocks = []  # Highlighted code segments of the bound item
+        self.code_block = None  # The open one, if any
+
+    def bind(self, item):
+        """Show an item, reusing the header and rebuilding the answer segments"""
+        self.model_label.config(text=item.model)
+        self.time_label.config(text=format_timestamp(item.timestamp))
+        self.info_label.config(text=item.info)
+
+        for block in self.code_blocks:
+            self.highlighter.cancel(block)
+        for widget in self.segments:
+            widget.destroy()
+        self.segments = []
+        self.fence_parser = FenceParser()
+        self.segment_widget = None
+        self.segment_text = ""
+        self.code_blocks = []
+        self.code_block = None
+
+        if item.thinking and not item.content:
+            self.show_thinking(item.thinking)
+        else:
+            self.think_text.pack_forget()
 
-        return frame, msg_frame
+        self.append_text(item.content)
+        if item.complete:
+            self.finish()
 
-    def add_thinking_message(self, message):
-        """Add or update thinking message"""
+    def show_thinking(self, thinking):
+        """Show the whole thinking text, replacing what was shown"""
         # Indicate that Deepseek is thinking
-        message = "Deepseek düşünüyor...\n\n" + message
-
-        if self.current_thinking_frame:
-            # Update existing thinking frame
-            for widget in self.current_thinking_frame.winfo_children():
-                if isinstance(widget, tk.Label) and widget.cget("font")[2] == "italic":
-                    widget.config(text=message)
-                    break
+        self.think_text.config(state="normal")
+        self.think_text.delete("1.0", "end")
+        append_text_view(self.think_text, "Deepseek düşünüyor...\n\n" + thinking)
+        if not self.think_text.winfo_manager():
+            self.think_text.pack(anchor="w", fill="x")
+
+    def append_thinking(self, delta):
+        """Append a thinking delta to the shown text"""
+        if not self.think_text.winfo_manager():
+            self.show_thinking(delta)
         else:
-            # Create new thinking frame
-            frame, msg_frame = self.add_new_ai_message_frame()
-
-            # Custom style for thinking mode
-            think_label = tk.Label(
-                msg_frame,
-                text=message,
-                wraplength=600,
-                justify="left",
-                bg=self.theme.think_bg,
-                fg=self.theme.think_fg,
-                padx=15,
-                pady=10,
-                font=("Segoe UI", 10, "italic"),
-            )
-            think_label.pack(anchor="w", fill="x")
-
-            self.current_thinking_frame = msg_frame
+            append_text_view(self.think_text, delta)
+
+    def append_text(self, delta):
+        """Append an answer delta, only touching the open segment"""
+        if not delta:
+            return
+
+        # The answer replaces the thinking message
+        self.think_text.pack_forget()
+        self.handle_segment_events(self.fence_parser.feed(delta))
+
+    def finish(self):
+        """Flush text the parser held back while waiting for a possible fence"""
+        self.handle_segment_events(self.fence_parser.close())
+
+    def handle_segment_events(self, events):
+        """Apply parser events to the segment widgets"""
+        for event, value in events:
+            if event == TEXT:
+                if self.segment_widget is None:
+                    # Skip whitespace-only gaps between code blocks
+                    self.segment_text += value
+                    if self.segment_text.strip():
+                        self.segment_widget = self.create_text_segment(self.segment_text)
+                else:
+                    append_text_view(self.segment_widget, value)
+
+            elif event == CODE_START:
+                self.segment_widget = self.create_code_segment("")
+                self.code_block = self.highlighter.open_block(self.segment_widget, value)
+                if self.code_block:
+                    self.code_blocks.append(self.code_block)
+
+            elif event == CODE:
+                lines_before = int(self.segment_widget.index("end-1c").split(".")[0])
+                self.segment_widget.config(state="normal")
+                self.segment_widget.insert("end", value)
+                self.segment_widget.config(state="disabled")
+                if "\n" in value:
+                    self.segment_widget.config(height=min(15, lines_before + value.count("\n") + 2))
+                if self.code_block:
+                    self.highlighter.feed(self.code_block, value)
+
+            elif event == CODE_END:
+                if self.code_block:
+                    self.highlighter.close(self.code_block)
+                    self.code_block = None
+
+                # Following text opens a new text segment
+                self.segment_widget = None
+                self.segment_text = ""
+
+    def create_text_segment(self, text):
+        """Create a text view inside the message"""
+        text_view = self.styles.register(create_text_view(self.msg_frame, ("Segoe UI", 10)), "ai_bubble")
+        append_text_view(text_view, text)
+        text_view.pack(anchor="w", fill="x")
+        self.segments.append(text_view)
+        return text_view
+
+    def create_code_segment(self, code):
+        """Create a code block inside the message"""
+        code_frame = self.styles.register(tk.Frame(self.msg_frame, padx=5, pady=5), "code_frame")
+        code_frame.pack(anchor="w", fill="x", pady=2)
+
+        code_text = self.styles.register(tk.Text(
+            code_frame,
+            wrap=tk.WORD,
+            width=70,
+            height=min(15, code.count('\n') + 3),
+            font=("Cascadia Code", 9),
+            padx=10,
+            pady=10,
+            relief="flat",
+        ), "code")
+        code_text.insert("1.0", code)
+        code_text.config(state="disabled")
+        code_text.pack(fill="both")
+        self.segments.append(code_frame)
+        return code_text
 
+
+class MessagesManager:
+    def __init__(self, chat_canvas, theme, model_var):
+        self.chat_canvas = chat_canvas
+        self.theme = theme
+        self.model_var = model_var
+
+        # Message widgets by role, recolored in place on theme change
+        self.styles = StyleRegistry(theme)
+
+        # Colors code segments off the Tk thread when Pygments is installed
+        self.highlighter = SyntaxHighlighter(theme)
+
+        # Only messages near the viewport have widgets
+        self.transcript = VirtualTranscript(chat_canvas, self.create_view)
+
+        # Index of the AI message that is currently streaming
+        self.current_ai_index = None
+
+    def create_view(self, role):
+        """Create the widgets used to display messages of a role"""
+        if role == "user":
+            return UserMessageView(self.chat_canvas, self.styles)
+        if role == "assistant":
+            return AIMessageView(self.chat_canvas, self.styles, self.highlighter)
+        return SystemMessageView(self.chat_canvas, self.styles)
+
+    def add_system_message(self, message):
+        """Add a gray system message (a notice, not part of the conversation)"""
+        self.transcript.append(Message(SYSTEM, message))
         self.scroll_to_bottom()
 
-    def add_ai_response(self, message):
-        """Add or update AI response"""
-        # Remove thinking frame
-        if self.current_thinking_frame:
-            parent = self.current_thinking_frame.master
-            parent.destroy()
-            self.current_thinking_frame = None
-
-        if self.current_ai_message_frame:
-            # Clear existing message widgets
-            for widget in self.current_ai_message_frame.winfo_children():
-                if not isinstance(widget, ttk.Frame):  # Preserve header frame
-                    widget.destroy()
-        else:
-            # Create new AI message frame
-            frame, msg_frame = self.add_new_ai_message_frame()
-            self.current_ai_message_frame = msg_frame
-
-        # Format code blocks
-        message_parts = []
-        current_pos = 0
-
-        # Detect code blocks (like ```python)
-        code_pattern = re.compile(r'```(.*?)```', re.DOTALL)
-        for match in code_pattern.finditer(message):
-            # Add text before code block
-            if match.start() > current_pos:
-                message_parts.append(("text", message[current_pos:match.start()]))
-
-            # Add code block
-            code_block = match.group(1)
-            # If language is specified (like ```python), remove first line
-            if "\n" in code_block and not code_block.startswith("\n"):
-                # Remove first line (language specifier)
-                code_lines = code_block.split("\n")
-                code_block = "\n".join(code_lines[1:])
-
-            message_parts.append(("code", code_block))
-            current_pos = match.end()
-
-        # Add remaining text
-        if current_pos < len(message):
-            message_parts.append(("text", message[current_pos:]))
-
-        # If no code blocks found, add entire message
-        if not message_parts:
-            message_parts.append(("text", message))
-
-        for part_type, part_content in message_parts:
-            if part_type == "text":
-                msg_label = tk.Label(
-                    self.current_ai_message_frame,
-                    text=part_content,
-                    wraplength=600,
-                    justify="left",
-                    bg=self.theme.ai_msg_bg,
-                    fg=self.theme.ai_msg_fg,
-                    padx=15,
-                    pady=10,
-                    font=("Segoe UI", 10),
-                )
-                msg_label.pack(anchor="w", fill="x")
-            elif part_type == "code":
-                code_frame = tk.Frame(self.current_ai_message_frame, bg="#1a1b26", padx=5, pady=5)
-                code_frame.pack(anchor="w", fill="x", pady=2)
-
-                code_text = tk.Text(
-                    code_frame,
-                    wrap=tk.WORD,
-                    width=70,
-                    height=min(15, part_content.count('\n') + 3),
-                    bg="#1a1b26",
-                    fg="#7dcfff",
-                    font=("Cascadia Code", 9),
-                    padx=10,
-                    pady=10,
-                    relief="flat",
-                )
-                code_text.insert("1.0", part_content)
-                code_text.config(state="disabled")
-                code_text.pack(fill="both")
+    def add_message(self, message):
+        """Show a conversation Message; the transcript shares the object with the conversation"""
+        self.transcript.append(message)
+        self.scroll_to_bottom()
+
+    def prepend_history(self, messages):
+        """Show older conversation Messages above the current ones"""
+        self.transcript.prepend(messages)
+        if self.current_ai_index is not None:
+            self.current_ai_index += len(messages)
+
+    def current_ai_item(self):
+        """Return the streaming AI Message, creating it on the first delta"""
+        if self.current_ai_index is None:
+            item = Message(ASSISTANT, timestamp=datetime.now(), model=self.model_var.get(), complete=False)
+            self.current_ai_index = self.transcript.append(item)
+            self.transcript.scroll_to_end()
+        return self.transcript.items[self.current_ai_index]
+
+    def append_thinking(self, delta):
+        """Append a streamed chunk to the thinking message"""
+        item = self.current_ai_item()
+        item.thinking += delta
+
+        view = self.transcript.view_for(self.current_ai_index)
+        if view and not item.content:
+            view.append_thinking(delta)
+        self.scroll_to_bottom()
+
+    def append_ai_response(self, delta):
+        """Append a streamed chunk to the AI response without rebuilding its widgets"""
+        item = self.current_ai_item()
+        item.content += delta
 
+        view = self.transcript.view_for(self.current_ai_index)
+        if view:
+            view.append_text(delta)
         self.scroll_to_bottom()
 
+    def finish_ai_response(self, info=""):
+        """Mark the streaming response as complete, with an optional header note"""
+        if self.current_ai_index is None:
+            return
+
+        item = self.transcript.items[self.current_ai_index]
+        item.complete = True
+        item.info = info
+        view = self.transcript.view_for(self.current_ai_index)
+        if view:
+            view.info_label.config(text=info)
+            view.finish()
+
+    def apply_theme(self):
+        """Recolor the existing message widgets for the current theme"""
+        self.styles.apply()
+        self.highlighter.apply_theme(self.styles.widgets["code"])
+
     def scroll_to_bottom(self):
         """Scroll chat canvas to bottom"""
-        self.chat_canvas.update_idletasks()
-        self.chat_canvas.yview_moveto(1.0)
+        self.transcript.scroll_to_end()
+
+    def close(self):
+        """Stop background work before the widgets are destroyed"""
+        self.highlighter.shutdown()
+
+    def clear(self):
+        """Remove all messages"""
+        self.transcript.clear()
+        self.reset_response_widgets()
 
     def reset_response_widgets(self):
         """Reset current response widgets"""
-        self.current_ai_message_frame = None
-        self.current_thinking_frame = None
-        self.is_thinking_active = False
\ No newline at end of file
+        self.current_ai_index = None
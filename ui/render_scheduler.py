@@ -0,0 +1,132 @@
+import threading
+import time
+from collections import deque
+
+from config.settings import RENDER_FPS
+from services.events import ThinkingDelta, AnswerDelta, Done, Error
+
+
+class RenderScheduler:
+    """Collect streamed deltas from worker threads and flush them to the UI at a bounded rate"""
+
+    def __init__(self, root_widget, fps=RENDER_FPS):
+        self.root_widget = root_widget
+        self.interval = 1.0 / max(1, fps)
+
+        # deque.append/popleft are atomic, so workers can push without taking the lock
+        self._queue = deque()
+        self._handlers = {}
+
+        self._lock = threading.Lock()
+        self._flush_pending = False
+        self._last_flush = 0.0
+
+    def set_handler(self, kind, handler):
+        """Register the UI-thread function that receives coalesced deltas of a kind"""
+        self._handlers[kind] = handler
+
+    def push(self, kind, delta):
+        """Queue a text delta (safe to call from any thread)"""
+        if delta:
+            self._queue.append((kind, delta))
+            self._request_flush()
+
+    def call(self, func):
+        """Queue a callback to run on the UI thread after every delta pushed before it"""
+        self._queue.append((None, func))
+        self._request_flush()
+
+    def discard(self):
+        """Drop everything that has not been flushed yet"""
+        self._queue.clear()
+
+    def _request_flush(self):
+        with self._lock:
+            if self._flush_pending:
+                return
+            self._flush_pending = True
+            delay = self._last_flush + self.interval - time.monotonic()
+
+        # At most one flush is scheduled at a time, so Tk callbacks scale with wall time
+        self.root_widget.after(max(0, int(delay * 1000)), self._flush)
+
+    def _flush(self):
+        # Clear the flag before draining so a concurrent push schedules the next flush
+        with self._lock:
+            self._flush_pending = False
+            self._last_flush = time.monotonic()
+
+        pending_kind = None
+        parts = []
+
+        # Only drain what is queued now; later items wait for the next frame
+        for _ in range(len(self._queue)):
+            kind, value = self._queue.popleft()
+
+            if kind != pending_kind and parts:
+                self._handlers[pending_kind]("".join(parts))
+                parts = []
+
+            if kind is None:
+                value()
+                pending_kind = None
+            else:
+                parts.append(value)
+                pending_kind = kind
+
+        if parts:
+            self._handlers[pending_kind]("".join(parts))
+
+
+class StreamBridge:
+    """Route events from the transport thread to the UI thread through a render scheduler"""
+
+    def __init__(self, render_scheduler, show_thinking, on_done, on_error, metrics=None):
+        self.render_scheduler = render_scheduler
+        self.show_thinking = show_thinking
+        self.on_done = on_done
+        self.on_error = on_error
+        self.metrics = metrics  # Optional ResponseMetrics timing events as they arrive
+        self.detached = False
+        self.finished = False  # A Done or Error event was forwarded
+
+    def detach(self):
+        """Stop forwarding events, e.g. after the chat they belong to was cleared"""
+        self.detached = True
+
+    def __call__(self, event):
+        if self.detached:
+            return
+
+        if self.metrics is not None:
+            self.metrics.observe(event)
+        if isinstance(event, (Done, Error)):
+            self.finished = True
+
+        if isinstance(event, ThinkingDelta):
+            if self.show_thinking:
+                self.render_scheduler.push("thinking", event.text)
+        elif isinstance(event, AnswerDelta):
+            self.render_scheduler.push("answer", event.text)
+        elif isinstance(event, Done):
+            self.render_scheduler.call(lambda: self.on_done(event))
+        elif isinstance(event, Error):
+            self.render_scheduler.call(lambda: self.on_error(event.error))
+
+    def watch(self, future):
+        """Report failures of the request future itself (e.g. a full queue)
+
+        A request cancelled before its job ever ran ends without events, so
+        it is reported as a truncated Done. Futures cancelled while still
+        queued are left to the caller, whose cancel() returned True.
+        """
+        def done(f):
+            if f.cancelled() or self.finished:
+                return
+            if f.exception() is not None:
+                self(Error(f.exception()))
+            else:
+                self(Done("", "", {}, truncated=True))
+
+        future.add_done_callback(done)
+        return future
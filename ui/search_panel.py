@@ -0,0 +1,109 @@
+import threading
+import os
+import tkinter as tk
+from tkinter import ttk
+
+from services.search_index import SearchIndex
+
+SEARCH_DELAY_MS = 150  # Wait for typing to pause before querying
+
+
+class SearchPanel:
+    """Window for searching saved conversations and opening a result"""
+
+    def __init__(self, app):
+        self.app = app
+        self.index = None
+        self.hits = []
+        self.search_id = None
+
+        theme = app.theme
+        self.window = tk.Toplevel(app.root, bg=theme.bg_color)
+        self.window.title("Konuşmalarda Ara")
+        self.window.geometry("640x420")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        frame = ttk.Frame(self.window)
+        frame.pack(fill="both", expand=True, padx=10, pady=10)
+
+        self.query_var = tk.StringVar()
+        self.entry = tk.Entry(
+            frame,
+            textvariable=self.query_var,
+            bg=theme.ai_msg_bg,
+            fg=theme.text_color,
+            insertbackground=theme.text_color,
+            relief="flat",
+            font=("Segoe UI", 10),
+        )
+        self.entry.pack(fill="x", ipady=5)
+        self.entry.bind("<KeyRelease>", lambda e: self.schedule_search())
+        self.entry.bind("<Return>", lambda e: self.open_selected())
+        self.entry.focus_set()
+
+        self.results = tk.Listbox(
+            frame,
+            bg=theme.ai_msg_bg,
+            fg=theme.ai_msg_fg,
+            selectbackground=theme.user_msg_bg,
+            relief="flat",
+            font=("Segoe UI", 9),
+            activestyle="none",
+        )
+        self.results.pack(fill="both", expand=True, pady=(10, 5))
+        self.results.bind("<Double-Button-1>", lambda e: self.open_selected())
+        self.results.bind("<Return>", lambda e: self.open_selected())
+
+        self.status_label = ttk.Label(frame, text="İndeks güncelleniyor...", style="TLabel")
+        self.status_label.pack(anchor="w")
+
+        # Loading and refreshing the index reads files, so it happens off the Tk thread
+        threading.Thread(target=self.prepare_index, daemon=True).start()
+
+    def prepare_index(self):
+        index = SearchIndex.load()
+        changed = index.update()
+        index.save()
+        self.app.root.after(0, lambda: self.on_index_ready(index, changed))
+
+    def on_index_ready(self, index, changed):
+        if not self.window.winfo_exists():
+            return
+
+        self.index = index
+        self.status_label.config(text=f"{index.doc_count} mesaj indekslendi ({changed} dosya güncellendi)")
+        self.search()
+
+    def schedule_search(self):
+        if self.search_id:
+            self.window.after_cancel(self.search_id)
+        self.search_id = self.window.after(SEARCH_DELAY_MS, self.search)
+
+    def search(self):
+        self.search_id = None
+        if self.index is None:
+            return
+
+        self.hits = self.index.search(self.query_var.get())
+        self.results.delete(0, tk.END)
+        for hit in self.hits:
+            self.results.insert(tk.END, f"{os.path.basename(hit.path)} #{hit.turn + 1}  {hit.snippet}")
+
+        if self.hits:
+            self.results.selection_set(0)
+        if self.query_var.get().strip():
+            self.status_label.config(text=f"{len(self.hits)} sonuç")
+
+    def open_selected(self):
+        selection = self.results.curselection()
+        if selection:
+            self.app.open_search_hit(self.hits[selection[0]])
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+        self.entry.focus_set()
+
+    def close(self):
+        self.window.destroy()
+        self.app.search_panel = None
@@ -0,0 +1,61 @@
+import tkinter as tk
+from tkinter import ttk
+
+from services.metrics import percentile
+
+COLUMNS = (
+    ("model", "Model", 160),
+    ("count", "Yanıt", 60),
+    ("tokens", "Token", 80),
+    ("ttft_p50", "İlk token p50", 100),
+    ("ttft_p95", "İlk token p95", 100),
+    ("eval_rate", "Token/sn", 80),
+    ("prompt_rate", "İstem token/sn", 110),
+)
+
+
+class StatsPanel:
+    """Window with generation metrics aggregated per model"""
+
+    def __init__(self, app):
+        self.app = app
+
+        self.window = tk.Toplevel(app.root, bg=app.theme.bg_color)
+        self.window.title("Performans İstatistikleri")
+        self.window.geometry("720x260")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
+
+        self.table = ttk.Treeview(self.window, columns=[c[0] for c in COLUMNS], show="headings")
+        for name, title, width in COLUMNS:
+            self.table.heading(name, text=title)
+            self.table.column(name, width=width, anchor="w" if name == "model" else "e")
+        self.table.pack(fill="both", expand=True, padx=10, pady=10)
+
+        app.metrics.listeners.append(self.refresh)
+        self.refresh()
+
+    def refresh(self):
+        self.table.delete(*self.table.get_children())
+        for stats in self.app.metrics.models.values():
+            self.table.insert("", tk.END, values=(
+                stats.model,
+                stats.count,
+                stats.tokens,
+                _format(percentile(stats.ttfts, 0.5), "{:.2f} sn"),
+                _format(percentile(stats.ttfts, 0.95), "{:.2f} sn"),
+                _format(stats.mean_eval_rate(), "{:.1f}"),
+                _format(stats.mean_prompt_rate(), "{:.1f}"),
+            ))
+
+    def lift(self):
+        self.window.deiconify()
+        self.window.lift()
+
+    def close(self):
+        self.app.metrics.listeners.remove(self.refresh)
+        self.window.destroy()
+        self.app.stats_panel = None
+
+
+def _format(value, pattern):
+    return pattern.format(value) if value is not None else "-"
@@ -0,0 +1,152 @@
+import queue
+import threading
+
+from utils.code_lexer import IncrementalLexer, TOKEN_TAGS, highlighting_available
+
+HIGHLIGHT_BATCH = 200  # Tag ranges added per Tk callback
+
+def configure_tags(text_widget, colors):
+    """Set the foreground color of every highlight tag on a Text widget"""
+    for tag in TOKEN_TAGS.values():
+        text_widget.tag_configure(tag, foreground=colors.get(tag, ""))
+
+
+class CodeBlock:
+    """A code segment being highlighted and the state of its lexing passes"""
+
+    def __init__(self, widget, language):
+        self.widget = widget
+        self.language = language
+        self.text = ""
+        self.lexer = None  # Created on the worker thread
+
+        self.pending = False  # A pass is being lexed or applied
+        self.dirty = False  # New complete lines arrived since the last pass
+        self.closed = False  # The fence was closed; the next pass is the final one
+        self.finished = False  # The final pass was submitted
+        self.cancelled = False
+
+
+class SyntaxHighlighter:
+    """Tag code segments with Pygments on a background thread while they stream
+
+    Each completed line triggers at most one pass in flight per block; the
+    worker re-lexes from the block's last checkpoint and the Tk thread applies
+    the resulting tags in small batches so long blocks never stall the UI.
+    Without Pygments, code blocks stay plain. shutdown() stops the worker.
+    """
+
+    def __init__(self, theme):
+        self.theme = theme
+        self.enabled = highlighting_available()
+        self.jobs = queue.Queue()
+        self.worker = None  # Started with the first pass
+        self.closed = False
+
+    def _run_worker(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            block, text, final = job
+            if block.cancelled or self.closed:
+                continue
+
+            # Pygments is imported here, on the first block, never on the Tk thread
+            if block.lexer is None:
+                block.lexer = IncrementalLexer(block.language)
+            result = block.lexer.lex(text, final)
+            block.widget.after(0, lambda b=block, r=result: self.apply(b, r))
+
+    def _submit(self, block, text, final):
+        if self.worker is None:
+            self.worker = threading.Thread(target=self._run_worker, name="syntax-highlight", daemon=True)
+            self.worker.start()
+        self.jobs.put((block, text, final))
+
+    def shutdown(self):
+        """Drop the queued passes and wait for the worker to stop (Tk thread)"""
+        self.closed = True
+        if self.worker is not None:
+            self.jobs.put(None)
+            self.worker.join(timeout=1)
+            self.worker = None
+
+    def open_block(self, text_widget, language):
+        """Start highlighting a code segment, or return None if it stays plain"""
+        if not self.enabled or self.closed or not language:
+            return None
+
+        configure_tags(text_widget, self.theme.syntax_colors)
+        return CodeBlock(text_widget, language)
+
+    def feed(self, block, delta):
+        """Record text appended to a block; complete lines schedule a pass"""
+        block.text += delta
+        if "\n" in delta:
+            block.dirty = True
+            self._schedule(block)
+
+    def close(self, block):
+        """The block is complete; lex its last line too"""
+        block.closed = True
+        self._schedule(block)
+
+    def cancel(self, block):
+        """Stop highlighting a block whose widget is being destroyed"""
+        block.cancelled = True
+
+    def _schedule(self, block):
+        if block.pending or block.cancelled or block.finished:
+            return
+        if not (block.dirty or block.closed):
+            return
+
+        block.pending = True
+        block.dirty = False
+        block.finished = block.closed
+        self._submit(block, block.text, block.closed)
+
+    def apply(self, block, result):
+        """Replace the tags of the re-lexed lines (Tk thread)"""
+        if block.cancelled or self.closed or not block.widget.winfo_exists():
+            return
+
+        if result is None:
+            self._pass_done(block)
+            return
+
+        first_line, ranges = result
+        start = f"{first_line}.0"
+        for tag in TOKEN_TAGS.values():
+            block.widget.tag_remove(tag, start, "end")
+
+        batches = []
+        step = 2 * HIGHLIGHT_BATCH
+        for tag, indices in ranges.items():
+            for i in range(0, len(indices), step):
+                batches.append((tag, indices[i:i + step]))
+        self._apply_batches(block, batches, 0)
+
+    def _apply_batches(self, block, batches, position):
+        if block.cancelled or self.closed or not block.widget.winfo_exists():
+            return
+
+        if position == len(batches):
+            self._pass_done(block)
+            return
+
+        # One tag_add call covers many ranges of the same tag
+        tag, indices = batches[position]
+        block.widget.tag_add(tag, *indices)
+        block.widget.after(1, lambda: self._apply_batches(block, batches, position + 1))
+
+    def _pass_done(self, block):
+        block.pending = False
+        self._schedule(block)
+
+    def apply_theme(self, text_widgets):
+        """Recolor the highlight tags of existing code segments"""
+        for text_widget in text_widgets:
+            configure_tags(text_widget, self.theme.syntax_colors)
@@ -0,0 +1,199 @@
+import bisect
+
+ITEM_PADX = 10
+ITEM_PADY = 5
+OVERSCAN = 1.0  # Screens kept materialized above and below the viewport
+POOL_SIZE = 8  # Recycled views kept per role
+
+
+def estimate_height(text):
+    """Rough pixel height of a message that has not been rendered yet"""
+    lines = sum(len(line) // 90 + 1 for line in text.split("\n"))
+    return 50 + 18 * lines
+
+
+class VirtualTranscript:
+    """Canvas-backed message list that only keeps widgets for items near the viewport
+
+    Items are conversation Messages; their `height` caches the rendered size.
+    Views are created by view_factory(role) and must expose a `frame` and a
+    `bind(item)` method. Views scrolled out of range are returned to a per-role
+    pool and rebound to other items instead of being destroyed.
+    """
+
+    def __init__(self, canvas, view_factory):
+        self.canvas = canvas
+        self.view_factory = view_factory
+
+        self.items = []
+        self.offsets = [0]  # offsets[i] is the top of item i, offsets[-1] the total height
+        self.views = {}  # Item index -> live view
+        self.pool = {}  # Role -> recycled views
+        self.width = 1
+
+        self._refresh_pending = False
+
+    def append(self, item):
+        """Add an item at the end and return its index"""
+        if not item.measured:
+            item.height = estimate_height(item.content)
+        self.items.append(item)
+        self.offsets.append(self.offsets[-1] + item.height + 2 * ITEM_PADY)
+        self._update_scrollregion()
+        return len(self.items) - 1
+
+    def prepend(self, items):
+        """Insert items before the first one, keeping the visible content still"""
+        if not items:
+            return
+
+        # Live views are keyed by index, which is about to shift
+        for index in list(self.views):
+            self._release(index)
+
+        for item in items:
+            if not item.measured:
+                item.height = estimate_height(item.content)
+
+        top = self.canvas.canvasy(0)
+        added = sum(item.height + 2 * ITEM_PADY for item in items)
+
+        self.items[:0] = items
+        offsets = [0]
+        for item in items:
+            offsets.append(offsets[-1] + item.height + 2 * ITEM_PADY)
+        self.offsets = offsets + [offset + added for offset in self.offsets[1:]]
+
+        self._update_scrollregion()
+        self.canvas.yview_moveto((top + added) / max(1, self.offsets[-1]))
+        self.schedule_refresh()
+
+    def view_for(self, index):
+        """Return the live view of an item, or None if it is not materialized"""
+        return self.views.get(index)
+
+    def clear(self):
+        """Remove every item and destroy all views"""
+        for index in list(self.views):
+            self._release(index)
+        for views in self.pool.values():
+            for view in views:
+                view.frame.destroy()
+
+        self.items = []
+        self.offsets = [0]
+        self.pool = {}
+        self._update_scrollregion()
+
+    def set_width(self, width):
+        """Resize live views to a new canvas width"""
+        self.width = width
+        for view in self.views.values():
+            self.canvas.itemconfig(view.window, width=self._view_width())
+        self._update_scrollregion()
+
+    def scroll_to_end(self):
+        """Scroll to the last item and materialize it"""
+        self._update_scrollregion()
+        self.canvas.yview_moveto(1.0)
+        self.refresh()
+        self.canvas.update_idletasks()
+        self.canvas.yview_moveto(1.0)
+
+    def scroll_to(self, index):
+        """Scroll so that an item is at the top of the viewport"""
+        self._update_scrollregion()
+        self.canvas.yview_moveto(self.offsets[index] / max(1, self.offsets[-1]))
+        self.refresh()
+
+    def schedule_refresh(self):
+        """Refresh the materialized range once the event loop is idle"""
+        if not self._refresh_pending:
+            self._refresh_pending = True
+            self.canvas.after_idle(self.refresh)
+
+    def refresh(self):
+        """Materialize items near the viewport and release the others"""
+        self._refresh_pending = False
+        if not self.canvas.winfo_exists():
+            # The session owning this canvas was closed
+            return
+
+        top = self.canvas.canvasy(0)
+        height = max(1, self.canvas.winfo_height())
+        margin = height * OVERSCAN
+
+        first = max(0, bisect.bisect_right(self.offsets, top - margin) - 1)
+        last = min(len(self.items), bisect.bisect_left(self.offsets, top + height + margin))
+
+        for index in list(self.views):
+            if index < first or index >= last:
+                self._release(index)
+
+        for index in range(first, last):
+            if index not in self.views:
+                self._materialize(index)
+
+    def _materialize(self, index):
+        item = self.items[index]
+        pool = self.pool.get(item.role)
+
+        if pool:
+            view = pool.pop()
+        else:
+            view = self.view_factory(item.role)
+            view.frame.bind("<Configure>", lambda e, v=view: self._on_view_configure(v, e.height))
+
+        view.index = index
+        view.bind(item)
+        view.window = self.canvas.create_window(
+            ITEM_PADX, self.offsets[index] + ITEM_PADY, window=view.frame, anchor="nw", width=self._view_width()
+        )
+        self.views[index] = view
+
+    def _release(self, index):
+        view = self.views.pop(index)
+        self.canvas.delete(view.window)
+        view.index = None
+        view.window = None
+
+        pool = self.pool.setdefault(self.items[index].role, [])
+        if len(pool) < POOL_SIZE:
+            pool.append(view)
+        else:
+            view.frame.destroy()
+
+    def _on_view_configure(self, view, height):
+        index = view.index
+        if index is None:
+            return
+
+        item = self.items[index]
+        item.measured = True
+        if height == item.height:
+            return
+
+        delta = height - item.height
+        item.height = height
+        top = self.canvas.canvasy(0)
+
+        # Shift every following item; streaming only grows the last one, so this is usually O(1)
+        for i in range(index + 1, len(self.offsets)):
+            self.offsets[i] += delta
+        for other_index, other in self.views.items():
+            if other_index > index:
+                self.canvas.coords(other.window, ITEM_PADX, self.offsets[other_index] + ITEM_PADY)
+
+        self._update_scrollregion()
+
+        # Keep the visible content still when an item above the viewport changes size
+        if self.offsets[index + 1] - delta <= top and self.offsets[-1] > 0:
+            self.canvas.yview_moveto((top + delta) / self.offsets[-1])
+
+        self.schedule_refresh()
+
+    def _view_width(self):
+        return max(1, self.width - 2 * ITEM_PADX)
+
+    def _update_scrollregion(self):
+        self.canvas.configure(scrollregion=(0, 0, self.width, self.offsets[-1]))
@@ -0,0 +1,121 @@
+import importlib.util
+
+# Highlight tag for each Pygments token type; subtypes use their closest listed parent
+TOKEN_TAGS = {
+    "Keyword": "syn_keyword",
+    "Name.Builtin": "syn_builtin",
+    "Name.Function": "syn_function",
+    "Name.Class": "syn_class",
+    "Name.Decorator": "syn_decorator",
+    "Literal.String": "syn_string",
+    "Literal.Number": "syn_number",
+    "Comment": "syn_comment",
+    "Operator": "syn_operator",
+}
+
+# Tags of tokens that can span lines; a checkpoint never starts inside one
+UNSAFE_TAGS = ("syn_string", "syn_comment")
+
+_lexers = {}  # Language -> lexer instance, or None if Pygments does not know it
+_token_tags = {}  # Token type -> tag name, or None for untagged text
+
+
+def highlighting_available():
+    """Whether the optional Pygments package is installed (checked without importing it)"""
+    return importlib.util.find_spec("pygments") is not None
+
+
+def get_lexer(language):
+    """Pygments lexer for a fence language tag, or None"""
+    if not language:
+        return None
+
+    language = language.lower()
+    if language not in _lexers:
+        from pygments.lexers import get_lexer_by_name
+        from pygments.util import ClassNotFound
+
+        try:
+            _lexers[language] = get_lexer_by_name(language)
+        except ClassNotFound:
+            _lexers[language] = None
+    return _lexers[language]
+
+
+def token_tag(token_type):
+    """Tag name for a token type, or None for untagged text"""
+    if token_type not in _token_tags:
+        tag = None
+        ttype = token_type
+        while ttype is not None and len(ttype):
+            name = ".".join(ttype)
+            if name in TOKEN_TAGS:
+                tag = TOKEN_TAGS[name]
+                break
+            ttype = ttype.parent
+        _token_tags[token_type] = tag
+    return _token_tags[token_type]
+
+
+class IncrementalLexer:
+    """Tokenize a growing code block, re-lexing only from the last safe checkpoint
+
+    A checkpoint is the start of a line that follows a blank line and whose
+    first token is outside any string or comment, where the lexer is back in
+    its initial state. Every pass lexes from the latest checkpoint; the caller
+    replaces the tags from the returned first line on with the new ranges.
+    Not thread-safe: use one instance per block from a single worker.
+    """
+
+    def __init__(self, language):
+        self.lexer = get_lexer(language)
+        self.checkpoint = 0  # Offset where the next pass starts lexing
+        self.checkpoint_line = 1
+
+    def lex(self, text, final=False):
+        """Return (first_line, {tag: [start, end, start, end, ...]}) with Text indices
+
+        Without final only complete lines are lexed; the last partial line
+        waits for the next pass or for the final one. Returns None when there
+        is nothing new to lex.
+        """
+        end = len(text) if final else text.rfind("\n") + 1
+        if self.lexer is None or end <= self.checkpoint:
+            return None
+
+        segment_start = self.checkpoint
+        first_line = self.checkpoint_line
+        ranges = {}
+
+        line = first_line
+        line_start = segment_start
+        col = 0
+        line_blank = True  # The current line has only whitespace so far
+        previous_blank = False  # The line before the current one was blank
+
+        for index, ttype, value in self.lexer.get_tokens_unprocessed(text[segment_start:end]):
+            tag = token_tag(ttype)
+            start_line, start_col = line, col
+
+            if line_blank and previous_blank and value.strip() and tag not in UNSAFE_TAGS:
+                self.checkpoint = line_start
+                self.checkpoint_line = line
+
+            # Advance the position over the token text
+            parts = value.split("\n")
+            if len(parts) == 1:
+                col += len(value)
+                line_blank = line_blank and not value.strip()
+            else:
+                line_blank = line_blank and not parts[0].strip()
+                for part in parts[1:]:
+                    previous_blank = line_blank
+                    line_blank = not part.strip()
+                line += len(parts) - 1
+                col = len(parts[-1])
+                line_start = segment_start + index + len(value) - col
+
+            if tag and value.strip():
+                ranges.setdefault(tag, []).extend((f"{start_line}.{start_col}", f"{line}.{col}"))
+
+        return first_line, ranges
@@ -1,32 +1,20 @@
 def format_timestamp(timestamp):
-    """Format timestamp for display"""
-    return timestamp.strftime("%H:%M")
+    """Format timestamp for display; messages loaded from old saves may have none"""
+    return timestamp.strftime("%H:%M") if timestamp else ""
 
 
 def extract_code_blocks(text):
     """Extract code blocks from markdown text"""
-    import re
+    from utils.markdown_stream import parse_segments
 
     code_blocks = []
     text_blocks = []
 
-    # Pattern for code blocks with optional language specifier
-    pattern = r'```(.*?)```'
-
-    # Split text by code blocks
-    parts = re.split(pattern, text, flags=re.DOTALL)
-
-    for i, part in enumerate(parts):
-        if i % 2 == 0:  # Even indices are regular text
-            if part.strip():
-                text_blocks.append(part)
-        else:  # Odd indices are code blocks
-            # Check if first line specifies language
-            lines = part.split('\n')
-            if len(lines) > 1 and not lines[0].strip().startswith(' '):
-                code_blocks.append((lines[0].strip(), '\n'.join(lines[1:])))
-            else:
-                code_blocks.append(('', part))
+    for kind, content, language in parse_segments(text):
+        if kind == "code":
+            code_blocks.append((language, content))
+        elif content.strip():
+            text_blocks.append(content)
 
     return text_blocks, code_blocks
 
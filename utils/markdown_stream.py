@@ -0,0 +1,119 @@
+# Segment events emitted by FenceParser
+TEXT = "text"  # Prose outside code blocks
+CODE_START = "code_start"  # A fence opened, value is the language tag ("" if none)
+CODE = "code"  # Code inside the open block
+CODE_END = "code_end"  # The open block was closed, value is None
+
+FENCE = "```"
+
+
+class FenceParser:
+    """Resumable code-fence parser that turns streamed deltas into segment events
+
+    Each call to feed() only looks at the new delta plus a few held-back
+    characters, so the cost per delta does not depend on the message length.
+    """
+
+    def __init__(self):
+        self.state = TEXT  # TEXT, "info" (reading the language line) or CODE
+        self.language = None
+        self._pending = ""  # Trailing backticks that may start a split fence
+        self._info = ""
+
+    def feed(self, delta):
+        """Parse a delta and return the list of (event, value) it completes"""
+        events = []
+        text = self._pending + delta
+        self._pending = ""
+
+        while text:
+            fence = text.find(FENCE)
+
+            if fence == -1:
+                # Hold back trailing backticks until the next delta decides them
+                keep = len(text) - len(text.rstrip("`"))
+                if keep:
+                    self._pending = text[-keep:]
+                    text = text[:-keep]
+                self._emit(events, text)
+                break
+
+            self._emit(events, text[:fence])
+            text = text[fence + len(FENCE):]
+
+            if self.state == TEXT:
+                # Opening fence, the rest of its line is the language tag
+                self.state = "info"
+                self._info = ""
+            elif self.state == "info":
+                # Fence closed on its opening line, so there was no language tag
+                events.append((CODE_START, ""))
+                if self._info:
+                    events.append((CODE, self._info))
+                events.append((CODE_END, None))
+                self.state = TEXT
+            else:
+                events.append((CODE_END, None))
+                self.state = TEXT
+
+        return events
+
+    def close(self):
+        """Flush held-back text and close an unterminated code block"""
+        events = []
+        text = self._pending
+        self._pending = ""
+        self._emit(events, text)
+
+        if self.state == "info":
+            # The opening line never ended, so it is shown as code rather than taken as a language
+            events.append((CODE_START, ""))
+            if self._info:
+                events.append((CODE, self._info))
+            self.state = CODE
+        if self.state == CODE:
+            events.append((CODE_END, None))
+            self.state = TEXT
+
+        return events
+
+    def _emit(self, events, text):
+        if not text:
+            return
+
+        if self.state == "info":
+            self._info += text
+            if "\n" not in self._info:
+                return
+            info, text = self._info.split("\n", 1)
+            # The language is the first word of the info string, e.g. "python" in "python title=app.py"
+            words = info.split()
+            self.language = words[0] if words else ""
+            self.state = CODE
+            events.append((CODE_START, self.language))
+            if not text:
+                return
+
+        event = CODE if self.state == CODE else TEXT
+        if events and events[-1][0] == event:
+            events[-1] = (event, events[-1][1] + text)
+        else:
+            events.append((event, text))
+
+
+def parse_segments(text):
+    """Split a complete message into ("text", content, None) and ("code", content, language) parts"""
+    parser = FenceParser()
+    segments = []
+    language = None
+
+    for event, value in parser.feed(text) + parser.close():
+        if event == TEXT:
+            segments.append(("text", value, None))
+        elif event == CODE_START:
+            language = value
+            segments.append(("code", "", language))
+        elif event == CODE:
+            segments[-1] = ("code", segments[-1][1] + value, language)
+
+    return segments
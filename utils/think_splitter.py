@@ -0,0 +1,62 @@
+# Kinds emitted by ThinkTagSplitter
+THINKING = "thinking"
+ANSWER = "answer"
+
+OPEN_TAG = "<think>"
+CLOSE_TAG = "</think>"
+
+
+class ThinkTagSplitter:
+    """Split streamed text into thinking and answer parts around <think> tags
+
+    Tags may straddle chunk boundaries or share a chunk with other text; the
+    tail of a chunk that could be the start of a tag is held back until the
+    next chunk decides it.
+    """
+
+    def __init__(self):
+        self.in_think = False
+        self._pending = ""
+
+    def feed(self, chunk):
+        """Return the list of (kind, text) parts completed by this chunk"""
+        parts = []
+        text = self._pending + chunk
+        self._pending = ""
+
+        while text:
+            tag = CLOSE_TAG if self.in_think else OPEN_TAG
+            index = text.find(tag)
+
+            if index == -1:
+                keep = _partial_tag_length(text, tag)
+                if keep:
+                    self._pending = text[-keep:]
+                    text = text[:-keep]
+                self._emit(parts, text)
+                break
+
+            self._emit(parts, text[:index])
+            text = text[index + len(tag):]
+            self.in_think = not self.in_think
+
+        return parts
+
+    def close(self):
+        """Flush held-back text at the end of the stream"""
+        parts = []
+        self._emit(parts, self._pending)
+        self._pending = ""
+        return parts
+
+    def _emit(self, parts, text):
+        if text:
+            parts.append((THINKING if self.in_think else ANSWER, text))
+
+
+def _partial_tag_length(text, tag):
+    """Length of the longest suffix of text that is a proper prefix of tag"""
+    for length in range(min(len(tag) - 1, len(text)), 0, -1):
+        if text.endswith(tag[:length]):
+            return length
+    return 0